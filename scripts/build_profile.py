@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Stage timing and memory instrumentation for the data build scripts
+
+Usage:
+    profile = BuildProfile('prepare_web_data')
+    profile.start(cpu=args.profile, trace_memory=args.profile)
+    with profile.stage('county.json') as stage:
+        data = process_county_data()
+        stage.rows = len(data['counties'])
+    profile.stop()
+    profile.write(Path('.build/build_profile.json'))
+
+Every stage records wall time, row count and the process peak RSS. With
+trace_memory the peak Python allocation of each stage is recorded as well
+(tracemalloc slows the run down); with cpu the whole run is profiled with
+cProfile and can be saved with dump_stats().
+"""
+
+import cProfile
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MB = 2 ** 20
+
+
+def peak_rss_mb(children=False):
+    """Peak resident set size of this process (or its finished children), or None if unavailable."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return round(usage.ru_maxrss * scale / MB, 1)
+
+
+class Stage:
+    """One timed stage; callers set .rows to the number of rows it handled."""
+
+    def __init__(self, name, depth):
+        self.name = name
+        self.depth = depth
+        self.rows = None
+        self.seconds = None
+        self.peak_rss_mb = None
+        self.traced_peak_mb = None
+        self.child_traced_peak = 0
+
+    def to_dict(self):
+        record = {'name': self.name, 'depth': self.depth, 'seconds': round(self.seconds, 4),
+                  'rows': self.rows, 'peakRssMB': self.peak_rss_mb}
+        if self.traced_peak_mb is not None:
+            record['tracedPeakMB'] = self.traced_peak_mb
+        return record
+
+
+class BuildProfile:
+    """Collects Stage records for one script run."""
+
+    def __init__(self, script):
+        self.script = script
+        self.stages = []
+        self.started = None
+        self.seconds = None
+        self.trace_memory = False
+        self._start = None
+        self._open = []
+        self._cpu = None
+
+    def start(self, cpu=False, trace_memory=False):
+        self.started = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        self.trace_memory = trace_memory
+        if trace_memory:
+            tracemalloc.start()
+        if cpu:
+            self._cpu = cProfile.Profile()
+            self._cpu.enable()
+        self._start = time.perf_counter()
+
+    def stop(self):
+        self.seconds = time.perf_counter() - self._start
+        if self._cpu is not None:
+            self._cpu.disable()
+        if self.trace_memory:
+            tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Time a block. Stages may nest: a nested stage is listed after its
+        parent with depth + 1, and the parent's time and memory include it.
+        """
+        stage = Stage(name, len(self._open))
+        self.stages.append(stage)
+
+        if self.trace_memory:
+            # The parent's peak so far is kept before the counter is reset for this stage
+            if self._open:
+                parent = self._open[-1]
+                parent.child_traced_peak = max(parent.child_traced_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+
+        self._open.append(stage)
+        start = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            stage.seconds = time.perf_counter() - start
+            stage.peak_rss_mb = peak_rss_mb()
+            self._open.pop()
+
+            if self.trace_memory:
+                peak = max(tracemalloc.get_traced_memory()[1], stage.child_traced_peak)
+                stage.traced_peak_mb = round(peak / MB, 1)
+                tracemalloc.reset_peak()
+                if self._open:
+                    parent = self._open[-1]
+                    parent.child_traced_peak = max(parent.child_traced_peak, peak)
+
+    def to_dict(self):
+        return {
+            'script': self.script,
+            'started': self.started,
+            'totalSeconds': round(self.seconds, 4) if self.seconds is not None else None,
+            'peakRssMB': peak_rss_mb(),
+            'childrenPeakRssMB': peak_rss_mb(children=True),
+            'traceMemory': self.trace_memory,
+            'stages': [stage.to_dict() for stage in self.stages]
+        }
+
+    def write(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write('\n')
+
+    def print_summary(self):
+        print(f"\nStage timings ({self.seconds:.2f}s total, peak RSS {peak_rss_mb()} MB):")
+        for stage in self.stages:
+            rows = f"  {stage.rows:,} rows" if stage.rows is not None else ""
+            memory = f"  {stage.traced_peak_mb} MB traced" if stage.traced_peak_mb is not None else ""
+            print(f"  {'  ' * stage.depth}{stage.name:<{32 - 2 * stage.depth}} {stage.seconds:8.3f}s{rows}{memory}")
+
+    def dump_stats(self, path, top=20):
+        """Save the cProfile stats (for snakeviz/pstats) and print the top functions by cumulative time."""
+        if self._cpu is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._cpu.dump_stats(path)
+        print(f"\ncProfile stats saved to: {path}")
+        pstats.Stats(self._cpu).sort_stats('cumulative').print_stats(top)
@@ -2,177 +2,729 @@
 """
 Extract Hawaii SNAP monthly data from FY files (FY89-FY25)
 Combines with existing data to create updated CSV
+
+Usage:
+    python extract_hawaii_snap.py
+    python extract_hawaii_snap.py --jobs 8
+    python extract_hawaii_snap.py --no-cache
+    python extract_hawaii_snap.py --source Data/snap-zip-fy69tocurrent-8.zip
+    python extract_hawaii_snap.py --profile
 """
 
+import argparse
+import hashlib
+import io
+import json
+import os
 import pandas as pd
 import glob
 import re
+import time
+import zipfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from pathlib import Path
 
-def extract_hawaii_from_fy_file(file_path):
+try:
+    from build_profile import BuildProfile
+except ImportError:  # imported as scripts.<module> from the repository root
+    from scripts.build_profile import BuildProfile
+
+# Bump whenever extraction logic changes so cached records are re-parsed
+EXTRACTOR_VERSION = 9
+
+CACHE_FILE = Path('Data/.cache/fy_extract_cache.json')
+
+# Per-stage timings of the last run, and cProfile stats with --profile
+EXTRACT_PROFILE = CACHE_FILE.parent / 'extract_profile.json'
+CPU_PROFILE = CACHE_FILE.parent / 'extract_profile.prof'
+
+DATA_SOURCE = 'Data/snap-zip-fy69tocurrent-8'
+
+FY_FILE_PATTERN = re.compile(r'^FY.*\.xlsx?$', re.IGNORECASE)
+
+# A workbook stored inside the FNS zip, read in memory without unpacking
+ZipMember = namedtuple('ZipMember', ['archive', 'member'])
+
+HAWAII_OUTPUT = 'Data/hawaii_snap_extracted_fy89-fy25.csv'
+NATIONAL_OUTPUT = 'Data/snap_national_monthly_fy89-fy25.csv'
+
+METRICS = ['Household', 'Persons', 'Per Household', 'Per Person', 'Cost']
+
+# Any FNS month label: "Oct 2023", "October 2023", "Sept. 2023", "OCT-23"
+MONTH_LABEL_PATTERN = r'^(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?[\s\-\']*(?:\d{4}|\d{2})\b'
+
+MONTH_LABEL_PARTS = re.compile(r'^([A-Za-z]+)\.?[\s\-\']*(\d{4}|\d{2})$')
+
+MONTH_NAMES = ['january', 'february', 'march', 'april', 'may', 'june', 'july',
+               'august', 'september', 'october', 'november', 'december']
+
+# Memoized label -> 'YYYY-MM-01' (or None) table shared by every parse
+_MONTH_LABEL_CACHE = {}
+
+# Metric -> column position for the two known FY workbook vintages
+LAYOUTS = {
+    'old': {'Household': 1, 'Persons': 2, 'Per Household': 3, 'Per Person': 4, 'Cost': 5},
+    'new': {'Household': 1, 'Persons': 2, 'Cost': 3, 'Per Household': 4, 'Per Person': 5},
+}
+
+# Header fingerprint -> layout, so each vintage is detected once per process
+_LAYOUT_CACHE = {}
+
+# Labels that head a block of month rows but are not states
+NON_STATE_LABELS = r'total|region|summary|\bro\b'
+
+def source_name(source):
+    """File name of a workbook on disk or inside a zip, e.g. 'FY24.xlsx'"""
+    if isinstance(source, ZipMember):
+        return Path(source.member).name
+    return Path(source).name
+
+
+def list_fy_sources(source=DATA_SOURCE):
     """
-    Extract Hawaii SNAP data from a single FY file
-    Hawaii data appears AFTER a row labeled "Hawaii"
+    List FY workbooks from an unpacked directory or straight from the FNS zip.
+    Zip members are returned as ZipMember so workers can open them independently.
     """
-    try:
-        # Try WRO sheet first (Western Region Office contains Hawaii)
+    if str(source).lower().endswith('.zip'):
+        with zipfile.ZipFile(source) as archive:
+            return [
+                ZipMember(str(source), info.filename)
+                for info in archive.infolist()
+                if not info.is_dir() and FY_FILE_PATTERN.match(Path(info.filename).name)
+            ]
+
+    return glob.glob(f'{source}/FY*.xls') + glob.glob(f'{source}/FY*.xlsx')
+
+
+def build_state_index(df, label_columns=(0,)):
+    """
+    Map each text label in the label column(s) to the first row offset it appears on,
+    e.g. {'alaska': 4, 'hawaii': 60, 'total': 17}
+    Keys are stripped and lower-cased. Built in one vectorized pass per label column.
+    """
+    index = {}
+    for col in label_columns:
+        if col >= df.shape[1]:
+            continue
+
+        labels = df.iloc[:, col].reset_index(drop=True)
+        labels = labels.astype('string').str.strip().str.lower()
+
+        # Only keep cells containing letters (skips counts, blanks and NaN)
+        labels = labels[labels.str.contains('[a-z]', regex=True, na=False)]
+        labels = labels[~labels.duplicated()]
+
+        for label, offset in zip(labels.tolist(), labels.index.tolist()):
+            if label not in index or offset < index[label]:
+                index[label] = offset
+
+    return index
+
+
+class WorkbookReader:
+    """
+    Opens a workbook once and streams rows from individual sheets.
+    .xlsx files use openpyxl in read-only mode, .xls files use xlrd on-demand
+    loading, so only the sheets that are actually read get parsed.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.is_xlsx = source_name(file_path).lower().endswith('.xlsx')
+
+        # Zip members are decompressed into memory and never touch the disk
+        contents = None
+        if isinstance(file_path, ZipMember):
+            with zipfile.ZipFile(file_path.archive) as archive:
+                contents = archive.read(file_path.member)
+
+        if self.is_xlsx:
+            import openpyxl
+            target = io.BytesIO(contents) if contents is not None else str(file_path)
+            self.book = openpyxl.load_workbook(target, read_only=True, data_only=True)
+        else:
+            import xlrd
+            if contents is not None:
+                self.book = xlrd.open_workbook(file_contents=contents, on_demand=True)
+            else:
+                self.book = xlrd.open_workbook(str(file_path), on_demand=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def sheet_names(self):
+        return self.book.sheetnames if self.is_xlsx else self.book.sheet_names()
+
+    def iter_rows(self, sheet_name):
+        """Yield each row of a sheet as a tuple, blanks as None"""
+        if self.is_xlsx:
+            sheet = self.book[sheet_name]
+            # FNS files do not always record their used range correctly
+            sheet.reset_dimensions()
+            yield from sheet.iter_rows(values_only=True)
+            return
+
+        sheet = self.book.sheet_by_name(sheet_name)
         try:
-            df = pd.read_excel(file_path, sheet_name='WRO', header=None)
-        except:
-            # If WRO doesn't exist, try other sheets
-            xls = pd.ExcelFile(file_path)
-            df = None
-            for sheet in xls.sheet_names:
-                temp_df = pd.read_excel(file_path, sheet_name=sheet, header=None)
-                # Check if Hawaii exists in this sheet
-                hawaii_exists = temp_df.apply(lambda row: row.astype(str).str.contains('^Hawaii$', regex=True, case=False, na=False).any(), axis=1).any()
-                if hawaii_exists:
-                    df = temp_df
-                    break
-
-            if df is None:
-                return None
-
-        # Find the row with "Hawaii" label
-        hawaii_mask = df.apply(lambda row: row.astype(str).str.contains('^Hawaii$', regex=True, case=False, na=False).any(), axis=1)
-
-        if not hawaii_mask.any():
+            for idx in range(sheet.nrows):
+                yield tuple(self.xls_value(cell) for cell in sheet.row(idx))
+        finally:
+            self.book.unload_sheet(sheet_name)
+
+    def xls_value(self, cell):
+        """
+        Match pandas: empty cells are missing, date cells (Excel serial numbers)
+        are datetimes, so month rows stored as dates are recognised, and
+        whole-number floats are ints
+        """
+        import xlrd
+        if cell.ctype == xlrd.XL_CELL_DATE:
+            return xlrd.xldate_as_datetime(cell.value, self.book.datemode)
+        value = cell.value
+        if value == '':
             return None
+        return int(value) if isinstance(value, float) and value.is_integer() else value
 
-        hawaii_label_row = hawaii_mask.idxmax()
+    def close(self):
+        if self.is_xlsx:
+            self.book.close()
+        else:
+            self.book.release_resources()
 
-        # Data starts AFTER the Hawaii label
-        # Find where Hawaii data ends (usually at next state name or empty rows)
-        data_start = hawaii_label_row + 1
 
-        # Collect Hawaii monthly data
-        hawaii_records = []
+def read_until_state_block(reader, sheet_name, state='Hawaii', block_rows=20):
+    """
+    Stream a sheet until `block_rows` rows past the state's label row.
+    Returns (rows read so far as a DataFrame, label row offset), or None
+    if the sheet does not contain the state.
+    """
+    target = state.lower()
+    rows = []
+    label_row = None
 
-        for idx in range(data_start, min(data_start + 20, len(df))):
-            row = df.iloc[idx]
+    for row in reader.iter_rows(sheet_name):
+        rows.append(row)
 
-            # Stop if we hit another state name or empty row
-            if pd.isna(row[0]):
-                continue
+        if label_row is None:
+            label = row[0] if row else None
+            if isinstance(label, str) and label.strip().lower() == target:
+                label_row = len(rows) - 1
+        elif len(rows) > label_row + block_rows:
+            break
 
-            month_str = str(row[0]).strip()
-
-            # Check if this looks like a month entry
-            if re.search(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s*\d{4}', month_str, re.IGNORECASE):
-                # Extract data - but column order differs between old and new files!
-                # Old files (.xls): Month, HH, Persons, PerHH, PerPerson, Cost
-                # New files (.xlsx): Month, HH, Persons, Cost, PerHH, PerPerson
-                # Detect which format by checking if col[3] is larger than col[4]
-                try:
-                    # If col[3] > col[4] significantly, it's likely Cost (new format)
-                    # If col[4] > col[3], it's likely PerHH is in col[3] (old format)
-                    col3_val = float(row[3]) if pd.notna(row[3]) else 0
-                    col4_val = float(row[4]) if pd.notna(row[4]) else 0
-
-                    # New format: Cost is typically in millions, PerHH is hundreds
-                    if col3_val > 10000:  # Cost is > $10k, so this is new format
-                        record = {
-                            'Month': month_str,
-                            'Household': row[1],
-                            'Persons': row[2],
-                            'Cost': row[3],
-                            'Per Household': row[4],
-                            'Per Person': row[5]
-                        }
-                    else:  # Old format
-                        record = {
-                            'Month': month_str,
-                            'Household': row[1],
-                            'Persons': row[2],
-                            'Per Household': row[3],
-                            'Per Person': row[4],
-                            'Cost': row[5]
-                        }
-                    hawaii_records.append(record)
-                except:
-                    pass
-            elif re.search(r'^[A-Z][a-z]+$', month_str) and month_str not in ['Hawaii', 'Total']:
-                # Hit another state, stop
-                break
+    if label_row is None:
+        return None
 
-        return hawaii_records if hawaii_records else None
+    return pd.DataFrame(rows), label_row
 
-    except Exception as e:
-        print(f"Error processing {file_path}: {e}")
+
+def label_strings(column):
+    """A label column as stripped strings; months stored as real date cells become 'Oct 2016'"""
+    labels = column.map(lambda v: v.strftime('%b %Y') if isinstance(v, datetime) else v)
+    return labels.astype('string').str.strip()
+
+
+def header_fingerprint(df):
+    """
+    Fingerprint a sheet's header layout: the header text of data columns 1-5,
+    joined down every row above the first month row.
+    Sheets from the same file vintage share a fingerprint.
+    """
+    labels = label_strings(df.iloc[:, 0])
+    is_month = labels.str.contains(MONTH_LABEL_PATTERN, case=False, regex=True, na=False)
+    first_month = int(is_month.to_numpy().argmax()) if is_month.any() else len(df)
+
+    header = df.iloc[:first_month, 1:6]
+    return tuple(
+        ' '.join(str(v).strip().lower() for v in header[col] if isinstance(v, str) and v.strip())
+        for col in header.columns
+    )
+
+
+def layout_from_header(fingerprint):
+    """Map metric -> column position from header text, or None if the header is not recognisable"""
+    layout = {}
+    for pos, text in enumerate(fingerprint, start=1):
+        # Whole words only: "per" is inside "persons", and old files head the
+        # participation counts "Average Number of Households/Persons" too
+        per_unit = bool(re.search(r'\bper\b', text)
+                        or re.search(r'\b(?:average|avg)\b', text) and 'benefit' in text)
+        if 'household' in text:
+            metric = 'Per Household' if per_unit else 'Household'
+        elif 'person' in text or 'participant' in text:
+            metric = 'Per Person' if per_unit else 'Persons'
+        elif any(word in text for word in ('cost', 'benefit', 'issuance')):
+            metric = 'Cost'
+        else:
+            continue
+        layout.setdefault(metric, pos)
+
+    if set(layout) != set(METRICS) or len(set(layout.values())) != len(METRICS):
         return None
+    return layout
 
-def parse_month_to_date(month_str):
-    """Convert 'Oct 2023' to '2023-10-01' format"""
-    try:
-        # Handle various formats
-        month_str = month_str.strip()
-
-        # Try parsing "Oct 2023" or "October 2023" format
-        for fmt in ['%b %Y', '%B %Y']:
-            try:
-                date_obj = datetime.strptime(month_str, fmt)
-                return date_obj.strftime('%Y-%m-01')
-            except:
+
+def layout_from_values(block):
+    """
+    Fall back to magnitudes when the header is not recognisable: Cost is the
+    column in position 3 or 5 with the larger median over the whole block,
+    so one month with an unusually small Cost cannot flip the layout.
+    """
+    col3 = pd.to_numeric(block.iloc[:, 3], errors='coerce').median()
+    col5 = pd.to_numeric(block.iloc[:, 5], errors='coerce').median()
+    return LAYOUTS['new'] if col3 > col5 else LAYOUTS['old']
+
+
+def detect_layout(df, block):
+    """Column layout for a sheet, cached per header fingerprint (file vintage)"""
+    fingerprint = header_fingerprint(df)
+    if fingerprint in _LAYOUT_CACHE:
+        return _LAYOUT_CACHE[fingerprint]
+
+    layout = layout_from_header(fingerprint) or layout_from_values(block)
+    # Without any header text there is nothing to tie the layout to a vintage
+    if any(fingerprint):
+        _LAYOUT_CACHE[fingerprint] = layout
+    return layout
+
+
+def parse_state_block(df, label_row, state, end_row=None, layout=None):
+    """
+    Parse the monthly rows that follow a state's label row.
+    Reads at most 20 rows, stopping early at end_row or the next state name.
+    The block is sliced and typed as a whole using the sheet's column layout.
+    """
+    # Data starts AFTER the state label
+    # Find where the block ends (usually at next state name or empty rows)
+    data_start = label_row + 1
+    data_end = min(data_start + 20, len(df) if end_row is None else end_row)
+
+    block = df.iloc[data_start:data_end].reindex(columns=range(6))
+
+    # Some workbooks store the month as a real date cell
+    months = label_strings(block[0])
+
+    is_month = months.str.contains(MONTH_LABEL_PATTERN, case=False, regex=True, na=False)
+    # Stop if we hit another state name
+    is_next_state = (months.str.fullmatch(r'[A-Z][a-z]+', na=False)
+                     & ~months.isin([state, 'Total']) & ~is_month)
+    if is_next_state.any():
+        stop = int(is_next_state.to_numpy().argmax())
+        block, months, is_month = block.iloc[:stop], months.iloc[:stop], is_month.iloc[:stop]
+
+    block, months = block[is_month.to_numpy()], months[is_month.to_numpy()]
+    if block.empty:
+        return []
+
+    # Column order differs between old and new files!
+    # Old files (.xls): Month, HH, Persons, PerHH, PerPerson, Cost
+    # New files (.xlsx): Month, HH, Persons, Cost, PerHH, PerPerson
+    if layout is None:
+        layout = detect_layout(df, block)
+
+    values = pd.DataFrame({'Month': months.astype(object).to_numpy()})
+    for metric in METRICS:
+        values[metric] = pd.to_numeric(block[layout[metric]], errors='coerce').to_numpy()
+
+    # Rows without any numbers (e.g. footnotes that look like months) are dropped
+    values = values.dropna(subset=METRICS, how='all')
+    return values.to_dict('records')
+
+
+def find_state_blocks(df):
+    """
+    Find every state block in a sheet: a text label immediately followed
+    (ignoring blank rows) by a month row.
+    Returns [(state, label_row, end_row)] where end_row is the next block's label row.
+    """
+    labels = label_strings(df.iloc[:, 0].reset_index(drop=True)).dropna()
+    labels = labels[labels != '']
+
+    is_month = labels.str.contains(MONTH_LABEL_PATTERN, case=False, regex=True)
+    is_text = labels.str.contains('[A-Za-z]', regex=True) & ~is_month
+    next_is_month = is_month.shift(-1, fill_value=False)
+
+    # Every labelled block (regional totals included) bounds the one before it,
+    # so non-state blocks are only dropped once the ends are known
+    block_rows = labels[is_text & next_is_month]
+    offsets = block_rows.index.tolist()
+    ends = offsets[1:] + [len(df)]
+
+    is_state = ~block_rows.str.contains(NON_STATE_LABELS, case=False, regex=True).to_numpy()
+    return [block for block, keep in zip(zip(block_rows.tolist(), offsets, ends), is_state) if keep]
+
+
+def extract_states_from_fy_file(file_path):
+    """
+    Extract every state's monthly block from a single FY file.
+    Each record carries a 'State' key; a state found on several sheets
+    keeps its first block. Returns None if no state block is found;
+    unreadable workbooks raise.
+    """
+    records = []
+    seen = set()
+
+    with WorkbookReader(file_path) as reader:
+        for sheet in reader.sheet_names:
+            df = pd.DataFrame(list(reader.iter_rows(sheet)))
+            if df.empty:
                 continue
 
+            blocks = find_state_blocks(df)
+            if not blocks:
+                continue
+
+            # One layout per sheet, detected from its header (or first block)
+            _, first_label, first_end = blocks[0]
+            layout = detect_layout(df, df.iloc[first_label + 1:first_end])
+
+            for state, label_row, end_row in blocks:
+                if state in seen:
+                    continue
+                seen.add(state)
+
+                for record in parse_state_block(df, label_row, state, end_row, layout):
+                    record['State'] = state
+                    records.append(record)
+
+    return records if records else None
+
+
+class NationalMonthlyCube:
+    """
+    State × month × metric view of the national extract.
+    Backed by a DataFrame indexed by a sorted (State, Date) MultiIndex, so
+    state and date-range slices are index lookups rather than scans.
+
+    Example:
+        cube = NationalMonthlyCube.from_csv()
+        cube.slice(states=['Hawaii', 'Alaska'], start='2020-01-01')
+        cube.metric('Persons', states=['Hawaii', 'Guam'])
+    """
+
+    def __init__(self, df):
+        df = df.copy()
+        df['Date'] = pd.to_datetime(df['Date'])
+        self.df = df.set_index(['State', 'Date'])[METRICS].sort_index()
+
+    @classmethod
+    def from_csv(cls, file_path=NATIONAL_OUTPUT):
+        return cls(pd.read_csv(file_path))
+
+    @property
+    def states(self):
+        return self.df.index.get_level_values('State').unique().tolist()
+
+    def slice(self, states=None, start=None, end=None, metrics=None):
+        """Long-format rows for the given states, date range (inclusive) and metrics"""
+        state_key = slice(None) if states is None else list(states)
+        date_key = slice(pd.Timestamp(start) if start else None, pd.Timestamp(end) if end else None)
+        return self.df.loc[(state_key, date_key), metrics or METRICS]
+
+    def metric(self, metric, states=None, start=None, end=None):
+        """One metric as a Date × State table, for comparing states side by side"""
+        return self.slice(states, start, end, [metric])[metric].unstack('State')
+
+
+def extract_hawaii_from_fy_file(file_path):
+    """
+    Extract Hawaii SNAP data from a single FY file
+    Hawaii data appears AFTER a row labeled "Hawaii"
+    Returns None if the file has no Hawaii block; unreadable workbooks raise.
+    """
+    # Open the workbook once; try the WRO sheet first (Western Region Office
+    # contains Hawaii), then the remaining sheets in workbook order
+    with WorkbookReader(file_path) as reader:
+        sheets = sorted(reader.sheet_names, key=lambda name: name != 'WRO')
+        found = None
+        for sheet in sheets:
+            found = read_until_state_block(reader, sheet, 'Hawaii')
+            if found is not None:
+                break
+
+    if found is None:
         return None
-    except:
+
+    # The reader already stopped on the row with the "Hawaii" label
+    df, hawaii_label_row = found
+
+    records = parse_state_block(df, hawaii_label_row, 'Hawaii')
+    return records if records else None
+
+def parse_month_to_date(month_str):
+    """Convert 'Oct 2023' to '2023-10-01' format (None if unrecognised)"""
+    if not isinstance(month_str, str):
         return None
 
-def main():
-    print("="*80)
-    print("Hawaii SNAP Monthly Data Extraction")
-    print("="*80)
+    month_str = month_str.strip()
+    if month_str in _MONTH_LABEL_CACHE:
+        return _MONTH_LABEL_CACHE[month_str]
 
-    data_dir = 'Data/snap-zip-fy69tocurrent-8'
+    date_str = None
+    match = MONTH_LABEL_PARTS.match(month_str)
+    if match:
+        word, year = match.group(1).lower(), int(match.group(2))
+        # "Oct", "October" and "Sept" are all prefixes of a full month name
+        month = next((i for i, name in enumerate(MONTH_NAMES, 1)
+                      if len(word) >= 3 and name.startswith(word)), None)
+        if year < 100:
+            year += 1900 if year >= 69 else 2000
+        if month:
+            date_str = f"{year:04d}-{month:02d}-01"
 
-    # Get all FY files (both .xls and .xlsx)
-    xls_files = sorted(glob.glob(f'{data_dir}/FY*.xls'))
-    xlsx_files = sorted(glob.glob(f'{data_dir}/FY*.xlsx'))
+    _MONTH_LABEL_CACHE[month_str] = date_str
+    return date_str
 
-    # Combine and sort (xls are older, xlsx are newer)
-    all_files = xls_files + xlsx_files
 
-    print(f"\nFound {len(all_files)} fiscal year files")
-    print(f"  From: {all_files[0].split('/')[-1] if all_files else 'None'}")
-    print(f"    To: {all_files[-1].split('/')[-1] if all_files else 'None'}\n")
+def normalize_month_labels(labels):
+    """
+    Convert a Series of month labels to 'YYYY-MM-01' strings.
+    Each distinct label is parsed once (and memoized across calls), then the
+    result is mapped back over the whole column in one pass.
+    Returns (dates, unparsed_labels).
+    """
+    labels = labels.astype('string').str.strip()
+    table = {label: parse_month_to_date(label) for label in labels.dropna().unique()}
 
-    all_hawaii_records = []
+    dates = labels.map(table).astype(object)
+    dates = dates.where(dates.notna(), None)
+    unparsed = sorted(label for label, date_str in table.items() if date_str is None)
 
-    for file_path in all_files:
-        file_name = file_path.split('/')[-1]
-        print(f"Processing {file_name}...", end=' ')
+    return dates, unparsed
 
-        records = extract_hawaii_from_fy_file(file_path)
+def fiscal_year_sort_key(file_path):
+    """
+    Sort key putting FY files in fiscal-year order.
+    Two-digit years roll over at 69 (FY69 is the oldest file FNS publishes),
+    so FY99 sorts before FY00.
+    """
+    name = source_name(file_path)
+    match = re.match(r'FY\s*(\d{2,4})', name, re.IGNORECASE)
+    if not match:
+        return (9999, name)
 
-        if records:
-            print(f"✓ Found {len(records)} months")
-            all_hawaii_records.extend(records)
-        else:
-            print("✗ No data found")
+    year = int(match.group(1))
+    if year < 100:
+        year += 1900 if year >= 69 else 2000
+    return (year, name)
 
-    print(f"\n{'='*80}")
-    print(f"Total records extracted: {len(all_hawaii_records)}")
 
-    if all_hawaii_records:
-        # Convert to DataFrame
-        df = pd.DataFrame(all_hawaii_records)
+def extract_timed(file_path, extractor=extract_hawaii_from_fy_file):
+    """
+    Run an extractor on one FY file and return (records, seconds, error).
+    A failed parse comes back as records None with the error message, so it
+    is reported (and kept out of the cache) rather than read as "no data".
+    """
+    start = time.perf_counter()
+    try:
+        records, error = extractor(file_path), None
+    except Exception as e:
+        records, error = None, f"{type(e).__name__}: {e}"
+    return records, time.perf_counter() - start, error
+
+
+def extract_all_files(all_files, jobs=1, extractor=extract_hawaii_from_fy_file):
+    """
+    Extract records from every FY file.
+    Yields (file_path, records, seconds, error) in the order of all_files, whether
+    the files are parsed sequentially or fanned out over a process pool.
+    """
+    if jobs <= 1 or len(all_files) <= 1:
+        for file_path in all_files:
+            yield (file_path, *extract_timed(file_path, extractor))
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # map() hands results back in submission order, which keeps output deterministic
+        results = executor.map(extract_timed, all_files, [extractor] * len(all_files))
+        for file_path, result in zip(all_files, results):
+            yield (file_path, *result)
+
+
+def file_sha256(file_path):
+    """Content hash of a workbook (on disk or inside a zip), read in 1 MB blocks"""
+    digest = hashlib.sha256()
+
+    if isinstance(file_path, ZipMember):
+        with zipfile.ZipFile(file_path.archive) as archive, archive.open(file_path.member) as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
 
-        # Parse dates
-        df['Date'] = df['Month'].apply(parse_month_to_date)
+def cache_key(content_hash, mode='hawaii'):
+    """Cache entries are only valid for the extractor version and mode that wrote them"""
+    return f"v{EXTRACTOR_VERSION}:{mode}:{content_hash}"
 
-        # Remove rows where date parsing failed
-        df = df[df['Date'].notna()]
+
+def load_extract_cache(cache_path=CACHE_FILE):
+    """Load the on-disk extraction cache, or an empty one if missing/corrupt"""
+    try:
+        with open(cache_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_extract_cache(cache, cache_path=CACHE_FILE):
+    """Write the extraction cache atomically"""
+    cache_path = Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        # Workbook cells come back as numpy scalars; store them as plain numbers
+        json.dump(cache, f, default=lambda o: o.item() if hasattr(o, 'item') else str(o))
+    os.replace(tmp_path, cache_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract Hawaii SNAP monthly data from FNS FY files")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of worker processes (0 = one per CPU core)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Re-parse every workbook, ignoring the extraction cache')
+    parser.add_argument('--source', default=DATA_SOURCE,
+                        help='Directory of FY workbooks, or the FNS zip itself (read without unpacking)')
+    parser.add_argument('--all-states', action='store_true',
+                        help=f'Extract every state into {NATIONAL_OUTPUT} (Hawaii output is written from the same pass)')
+    parser.add_argument('--profile', action='store_true',
+                        help=f'Trace per-stage memory and save cProfile stats to {CPU_PROFILE} '
+                             '(worker processes are not profiled)')
+    args = parser.parse_args()
+
+    profile = BuildProfile('extract_hawaii_snap')
+    profile.start(cpu=args.profile, trace_memory=args.profile)
+    try:
+        extract(args, profile)
+    finally:
+        profile.stop()
+        profile.write(EXTRACT_PROFILE)
+        profile.print_summary()
+        print(f"Build profile saved to: {EXTRACT_PROFILE}")
+        if args.profile:
+            profile.dump_stats(CPU_PROFILE)
+
+
+def extract(args, profile):
+
+    mode = 'states' if args.all_states else 'hawaii'
+    extractor = extract_states_from_fy_file if args.all_states else extract_hawaii_from_fy_file
+    unit = 'state-months' if args.all_states else 'months'
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    print("="*80)
+    print("Hawaii SNAP Monthly Data Extraction")
+    print("="*80)
+
+    # Get all FY files (both .xls and .xlsx) in fiscal-year order
+    with profile.stage('list sources') as stage:
+        all_files = sorted(list_fy_sources(args.source), key=fiscal_year_sort_key)
+        stage.rows = len(all_files)
+
+    print(f"\nFound {len(all_files)} fiscal year files in {args.source}")
+    print(f"  From: {source_name(all_files[0]) if all_files else 'None'}")
+    print(f"    To: {source_name(all_files[-1]) if all_files else 'None'}")
+    print(f"  Jobs: {jobs}")
+
+    all_records = []
+    total_start = time.perf_counter()
+
+    # Only workbooks whose bytes changed since the last run get parsed
+    with profile.stage('hash workbooks') as stage:
+        old_cache = load_extract_cache()
+        reusable = {} if args.no_cache else old_cache
+        keys = {file_path: cache_key(file_sha256(file_path), mode) for file_path in all_files}
+        to_parse = [file_path for file_path in all_files if keys[file_path] not in reusable]
+        stage.rows = len(all_files)
+    parsed = extract_all_files(to_parse, jobs, extractor)
+    # Entries for files that disappeared from the archive are dropped,
+    # entries written by the other mode are kept
+    new_cache = {key: entry for key, entry in old_cache.items() if f":{mode}:" not in key}
+
+    print(f" Cache: {len(all_files) - len(to_parse)} unchanged, {len(to_parse)} to parse\n")
+
+    with profile.stage('parse workbooks') as stage:
+        for file_path in all_files:
+            file_name = source_name(file_path)
+            key = keys[file_path]
+
+            if key in reusable:
+                records, error = reusable[key]['records'], None
+                timing = "cached"
+            else:
+                _, records, seconds, error = next(parsed)
+                timing = f"{seconds:.2f}s"
+
+            # Failed parses are not cached, so the next run tries the file again
+            if error is None:
+                new_cache[key] = {'file': file_name, 'records': records}
+
+            print(f"Processing {file_name}...", end=' ')
+
+            if error is not None:
+                print(f"✗ Error: {error} ({timing})")
+            elif records:
+                print(f"✓ Found {len(records)} {unit} ({timing})")
+                all_records.extend(records)
+            else:
+                print(f"✗ No data found ({timing})")
+        stage.rows = len(all_records)
+
+    with profile.stage('save cache'):
+        save_extract_cache(new_cache)
+
+    print(f"\n{'='*80}")
+    print(f"Total records extracted: {len(all_records)}")
+    print(f"Extraction time: {time.perf_counter() - total_start:.2f}s")
+
+    if all_records:
+        with profile.stage('normalize months') as stage:
+            # Convert to DataFrame
+            df = pd.DataFrame(all_records)
+
+            # Parse dates
+            df['Date'], unparsed = normalize_month_labels(df['Month'])
+            if unparsed:
+                print(f"⚠ {len(unparsed)} month labels could not be parsed: {unparsed}")
+
+            # Remove rows where date parsing failed
+            df = df[df['Date'].notna()]
+            stage.rows = len(df)
+
+        if args.all_states:
+            # One row per state-month, sorted for NationalMonthlyCube
+            national = df.sort_values(['State', 'Date'], kind='stable')[['State', 'Date'] + METRICS]
+            with profile.stage('write national csv') as stage:
+                national.to_csv(NATIONAL_OUTPUT, index=False)
+                stage.rows = len(national)
+            print(f"National data saved to: {NATIONAL_OUTPUT}")
+            print(f"  States: {national['State'].nunique()}, rows: {len(national)}")
+
+            df = df[df['State'] == 'Hawaii']
 
         # Sort by date
         df = df.sort_values('Date')
 
         # Reorder columns to match existing CSV format
-        df = df[['Date', 'Household', 'Persons', 'Per Household', 'Per Person', 'Cost']]
+        df = df[['Date'] + METRICS]
 
         # Save the extracted data
-        output_file = 'Data/hawaii_snap_extracted_fy89-fy25.csv'
-        df.to_csv(output_file, index=False)
+        output_file = HAWAII_OUTPUT
+        with profile.stage('write hawaii csv') as stage:
+            df.to_csv(output_file, index=False)
+            stage.rows = len(df)
 
         print(f"Data saved to: {output_file}")
         print(f"\nDate range: {df['Date'].min()} to {df['Date'].max()}")
@@ -1,25 +1,243 @@
 #!/usr/bin/env python3
 """
 Convert Hawaii SNAP CSV data to JSON for web visualization
+
+Usage:
+    python prepare_web_data.py
+    python prepare_web_data.py --force
+    python prepare_web_data.py --compact
+    python prepare_web_data.py --profile
+    python prepare_web_data.py --engine pandas
+
+pandas and numpy are only imported by the pandas engine; the default stdlib
+engine produces byte-identical outputs from the csv module alone.
 """
 
-import pandas as pd
+import argparse
+import csv
+import gzip
+import hashlib
 import json
-from pathlib import Path
-from datetime import datetime
+import math
+import re
+import shutil
+import sys
+from array import array
+from collections import namedtuple
+from functools import lru_cache
+from itertools import groupby
+from pathlib import Path, PurePosixPath
+
+try:
+    from build_profile import BuildProfile
+except ImportError:  # imported as scripts.<module> from the repository root
+    from scripts.build_profile import BuildProfile
 
 DATA_DIR = Path(__file__).parent.parent / "Data"
 WEB_DIR = Path(__file__).parent.parent / "web" / "data"
 
+# Records input hashes per output so unchanged outputs are not rewritten.
+# Kept outside web/ so it is not deployed.
+BUILD_MANIFEST = Path(__file__).parent.parent / ".build" / "web_data_manifest.json"
+
+# Per-stage timings of the last run, and cProfile stats with --profile
+BUILD_PROFILE = BUILD_MANIFEST.parent / "build_profile.json"
+CPU_PROFILE = BUILD_MANIFEST.parent / "build_profile.prof"
+
+PROFILE = BuildProfile('prepare_web_data')
+
+# Content-hashed copies of every output, cached as immutable by netlify.toml.
+# data/manifest.json maps each output name to its copy (relative to web/).
+ASSET_DIR = WEB_DIR.parent / "assets"
+ASSET_MANIFEST = 'manifest.json'
+ASSET_HASH_LENGTH = 10
+
+# Copies the current and previous data/manifest.json reference. The previous
+# generation stays published so pages loaded before a deploy can still open
+# their lazily loaded tabs. Commit it together with web/assets/.
+ASSET_HISTORY = BUILD_MANIFEST.parent / "published_assets.json"
+
+# Bump whenever stage logic or JSON layout changes so every output is rebuilt
+GENERATOR_VERSION = 7
+
+# Decimal places kept for floats in every JSON output
+FLOAT_PRECISION = 2
+
+ISO_MONTH = re.compile(r'^\d{4}-\d{2}-01$')
+ISO_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# Source CSVs shared by the processing stages: file name, column dtypes,
+# ISO date columns and the sort order every stage can rely on
+DATASETS = {
+    'monthly': {
+        'file': "Statewide Monthly SNAP FY 89-25.csv",
+        'dtypes': {
+            'Household': 'int64',
+            'Persons': 'int64',
+            'Per Household': 'float64',
+            'Per Person': 'float64',
+            'Cost': 'int64'
+        },
+        'dates': ['Date'],
+        'sort': ['Date']
+    },
+    'county': {
+        'file': "County Bi-Annual SNAP 89-21.csv",
+        'dtypes': {
+            'FIPS': 'int64',
+            'State': 'string',
+            'County': 'string',
+            'SNAP All Persons Public Assistance Participation': 'int64',
+            'SNAP All Persons Non-Public Assistance Participation': 'int64',
+            'Calc: SNAP Total PA and Non-PA People': 'int64',
+            'SNAP All Households Public Assistance Participation': 'int64',
+            'SNAP All Households Non-Public Assistance Participation': 'int64',
+            'Calc: SNAP Total PA and Non-PA Households': 'int64',
+            'SNAP All Total Actual PA & Non-PA Issuance': 'int64'
+        },
+        'dates': ['Date'],
+        'sort': ['Date', 'State', 'County']
+    }
+}
+
+# Point counts of the downsampled (level-of-detail) copies of the long-history
+# chart series; LOD_FULL holds the same series at full resolution
+LOD_LEVELS = [60, 120, 240]
+LOD_SERIES = ['households', 'persons']
+LOD_FULL = 'lod-full.json'
+
+# The client loads the smallest level with at least one point per this many
+# CSS pixels of chart width
+LOD_PIXELS_PER_POINT = 3
+
+# Lazily loaded per-tab, per-decade and per-county files live under this
+# directory of WEB_DIR and are listed in its index.json
+SHARD_DIR = 'shards'
+SHARD_INDEX = f'{SHARD_DIR}/index.json'
+
+# Small outputs every page load starts from, embedded in manifest.json so the
+# first chart does not wait for them one fetch after another
+INLINE_OUTPUTS = [SHARD_INDEX, 'lod.json']
+
+# First month plotted by the long-history charts; their tabs only reference
+# the decade shards from here on
+CHART_START = '1999-01-01'
+
+# Source datasets each output is generated from
+OUTPUTS = {
+    'monthly.json': ['monthly'],
+    'county.json': ['county'],
+    'trends.json': ['monthly'],
+    'metadata.json': ['monthly'],
+    'series.json': ['monthly', 'county'],
+    'series.bin': ['monthly', 'county'],
+    'derived.json': ['monthly'],
+    'lod.json': ['monthly'],
+    **{f'lod-{points}.json': ['monthly'] for points in LOD_LEVELS},
+    LOD_FULL: ['monthly'],
+    SHARD_INDEX: ['monthly', 'county']
+}
+
+# Monthly columns packed into series.bin: name -> (column, binary type)
+MONTHLY_SERIES = {
+    'households': ('Household', 'int32'),
+    'persons': ('Persons', 'int32'),
+    'avgBenefitPerHousehold': ('Per Household', 'float32'),
+    'avgBenefitPerPerson': ('Per Person', 'float32'),
+    'totalCost': ('Cost', 'int32')
+}
+
+COUNTY_SERIES = {
+    'persons': ('Calc: SNAP Total PA and Non-PA People', 'int32'),
+    'households': ('Calc: SNAP Total PA and Non-PA Households', 'int32')
+}
+
+BINARY_TYPES = {'int32': '<i4', 'float32': '<f4'}
+
+# array module type codes of the same binary types (4 bytes on every supported platform)
+ARRAY_TYPES = {'int32': 'i', 'float32': 'f'}
+
+# The monthly dataset as plain lists, shared by the stages of both engines:
+# 'YYYY-MM-DD' labels, {MONTHLY_SERIES key: values} and
+# {MONTHLY_SERIES key: {DERIVED_MEASURES entry: rounded values or None}}
+MonthlyColumns = namedtuple('MonthlyColumns', ['labels', 'datasets', 'derived'])
+
+# Trend measures derived for every month of every MONTHLY_SERIES metric
+# (percentages for yoy/mom/cumulative, metric units for the rolling means)
+DERIVED_MEASURES = ['yoy', 'mom', 'rolling3', 'rolling12', 'cumulative']
+
+# COVID-era periods summarised in trends.json, as [start, end) bounds
+TRENDS_START = '2019-01-01'
+COVID_PERIODS = {
+    'preCovid': ('2019-01-01', '2020-03-01'),
+    'covidStart': ('2020-03-01', '2021-01-01'),
+    'covidPeak': ('2021-01-01', '2021-09-01'),
+    'postCovid': ('2021-09-01', None)
+}
+
+
+@lru_cache(maxsize=None)
+def load_dataset(name):
+    """
+    Read, type and sort a source CSV once per build.
+    Every stage receives the same frame, so stages must not modify it in place.
+    """
+    import pandas as pd
+
+    spec = DATASETS[name]
+    with PROFILE.stage(f"load {name}") as stage:
+        df = pd.read_csv(DATA_DIR / spec['file'], dtype=spec['dtypes'])
+
+        for col in spec['dates']:
+            df[col] = pd.to_datetime(df[col], format='%Y-%m-%d', errors='coerce')
+
+        df = df.sort_values(spec['sort'], kind='stable').reset_index(drop=True)
+        stage.rows = len(df)
+
+    return df
+
+
+@lru_cache(maxsize=None)
+def derive_monthly_metrics():
+    """
+    Trend measures for every month and every MONTHLY_SERIES metric in one
+    vectorized pass. Values are first put on a complete month index, so a
+    missing month yields gaps rather than comparisons against the wrong month.
+    Columns are (measure, metric), with 'yearAgo' holding the value twelve
+    months earlier; rows are indexed by the source dates.
+    """
+    import pandas as pd
+
+    df = load_dataset('monthly')
+    values = df.set_index('Date')[[col for col, _ in MONTHLY_SERIES.values()]].astype('float64')
+    values.columns = list(MONTHLY_SERIES)
+    aligned = values.asfreq('MS')
+
+    derived = pd.concat({
+        'yearAgo': aligned.shift(12),
+        'yoy': aligned.pct_change(12, fill_method=None) * 100,
+        'mom': aligned.pct_change(1, fill_method=None) * 100,
+        'rolling3': aligned.rolling(3).mean(),
+        'rolling12': aligned.rolling(12).mean(),
+        'cumulative': (aligned / aligned.iloc[0] - 1) * 100
+    }, axis=1)
+
+    return derived.reindex(values.index)
+
+
+def derived_measures_table():
+    """DERIVED_MEASURES columns rounded for output, with gaps as None."""
+    derived = derive_monthly_metrics()[DERIVED_MEASURES].round(2)
+    return derived.astype(object).where(derived.notna(), None)
+
+
 def process_monthly_data():
     """Process statewide monthly data for web charts."""
-    print("Processing monthly data...")
+    import pandas as pd
 
-    df = pd.read_csv(DATA_DIR / "Statewide Monthly SNAP FY 89-25.csv")
-    df['Date'] = pd.to_datetime(df['Date'])
+    print("Processing monthly data...")
 
-    # Sort by date
-    df = df.sort_values('Date')
+    df = load_dataset('monthly')
 
     # Convert to format for Chart.js
     data = {
@@ -72,25 +290,22 @@ def process_monthly_data():
         }
     }
 
-    # Calculate year-over-year changes
-    latest = df.iloc[-1]
-    year_ago_idx = max(0, len(df) - 13)  # 12 months ago
-    year_ago = df.iloc[year_ago_idx]
-
-    data['yearOverYear'] = {
-        'households': {
-            'current': int(latest['Household']),
-            'yearAgo': int(year_ago['Household']),
-            'change': int(latest['Household'] - year_ago['Household']),
-            'percentChange': round((latest['Household'] - year_ago['Household']) / year_ago['Household'] * 100, 2)
-        },
-        'persons': {
-            'current': int(latest['Persons']),
-            'yearAgo': int(year_ago['Persons']),
-            'change': int(latest['Persons'] - year_ago['Persons']),
-            'percentChange': round((latest['Persons'] - year_ago['Persons']) / year_ago['Persons'] * 100, 2)
+    # Year-over-year change for the latest month against the same month a year
+    # earlier (None when that month is missing from the source)
+    derived = derive_monthly_metrics()
+    data['yearOverYear'] = {}
+    for key in ('households', 'persons'):
+        current = df[MONTHLY_SERIES[key][0]].iloc[-1]
+        year_ago = derived['yearAgo', key].iloc[-1]
+        if pd.isna(year_ago):
+            data['yearOverYear'][key] = None
+            continue
+        data['yearOverYear'][key] = {
+            'current': int(current),
+            'yearAgo': int(year_ago),
+            'change': int(current - year_ago),
+            'percentChange': round((current - year_ago) / year_ago * 100, 2)
         }
-    }
 
     return data
 
@@ -99,50 +314,70 @@ def process_county_data():
     """Process county bi-annual data for geographic comparisons."""
     print("Processing county data...")
 
-    df = pd.read_csv(DATA_DIR / "County Bi-Annual SNAP 89-21.csv")
-    df['Date'] = pd.to_datetime(df['Date'])
+    df = load_dataset('county')
+    persons_col = 'Calc: SNAP Total PA and Non-PA People'
+    households_col = 'Calc: SNAP Total PA and Non-PA Households'
+    issuance_col = 'SNAP All Total Actual PA & Non-PA Issuance'
+
+    # One groupby over FIPS (county names repeat across states). load_dataset sorts
+    # by Date then County, so each group is in date order and its last row is the
+    # county's latest snapshot.
+    grouped = df.assign(DateLabel=df['Date'].dt.strftime('%Y-%m-%d')).groupby('FIPS', sort=False)
+    last_rows = grouped.tail(1)
+    series = grouped.agg(
+        dates=('DateLabel', lambda s: s.tolist()),
+        persons=(persons_col, lambda s: s.tolist()),
+        households=(households_col, lambda s: s.tolist())
+    )
 
     # Get latest data for each county
     latest_date = df['Date'].max()
-    latest = df[df['Date'] == latest_date].copy()
+    latest = last_rows[last_rows['Date'] == latest_date]
 
     data = {
         'asOfDate': latest_date.strftime('%Y-%m-%d'),
         'counties': []
     }
 
-    for _, row in latest.iterrows():
+    # Key time series by county name, adding the state only where names collide
+    duplicate_names = latest['County'].duplicated(keep=False).tolist()
+
+    counties_over_time = {}
+    for row, duplicate in zip(latest.to_dict('records'), duplicate_names):
         data['counties'].append({
             'name': row['County'],
-            'fips': row['FIPS'],
+            'fips': int(row['FIPS']),
             'persons': {
                 'publicAssistance': int(row['SNAP All Persons Public Assistance Participation']),
                 'nonPublicAssistance': int(row['SNAP All Persons Non-Public Assistance Participation']),
-                'total': int(row['Calc: SNAP Total PA and Non-PA People'])
+                'total': int(row[persons_col])
             },
             'households': {
                 'publicAssistance': int(row['SNAP All Households Public Assistance Participation']),
                 'nonPublicAssistance': int(row['SNAP All Households Non-Public Assistance Participation']),
-                'total': int(row['Calc: SNAP Total PA and Non-PA Households'])
+                'total': int(row[households_col])
             },
-            'totalIssuance': int(row['SNAP All Total Actual PA & Non-PA Issuance'])
+            'totalIssuance': int(row[issuance_col])
         })
 
+        key = f"{row['County']}, {row['State']}" if duplicate else row['County']
+        counties_over_time[key] = series.loc[row['FIPS']].to_dict()
+
     # Calculate totals
+    state_totals = latest.groupby('State', sort=True)[[persons_col, households_col, issuance_col]].sum()
     data['stateTotal'] = {
-        'persons': sum(c['persons']['total'] for c in data['counties']),
-        'households': sum(c['households']['total'] for c in data['counties']),
-        'totalIssuance': sum(c['totalIssuance'] for c in data['counties'])
+        'persons': int(state_totals[persons_col].sum()),
+        'households': int(state_totals[households_col].sum()),
+        'totalIssuance': int(state_totals[issuance_col].sum())
     }
-
-    # Calculate county time series
-    counties_over_time = {}
-    for county in latest['County'].unique():
-        county_df = df[df['County'] == county].sort_values('Date')
-        counties_over_time[county] = {
-            'dates': county_df['Date'].dt.strftime('%Y-%m-%d').tolist(),
-            'persons': county_df['Calc: SNAP Total PA and Non-PA People'].tolist(),
-            'households': county_df['Calc: SNAP Total PA and Non-PA Households'].tolist()
+    if len(state_totals) > 1:
+        data['stateTotals'] = {
+            state: {
+                'persons': int(row[persons_col]),
+                'households': int(row[households_col]),
+                'totalIssuance': int(row[issuance_col])
+            }
+            for state, row in state_totals.iterrows()
         }
 
     data['timeSeries'] = counties_over_time
@@ -152,33 +387,34 @@ def process_county_data():
 
 def process_recent_trends():
     """Extract recent trends and COVID impact."""
+    import pandas as pd
+
     print("Processing recent trends...")
 
-    df = pd.read_csv(DATA_DIR / "Statewide Monthly SNAP FY 89-25.csv")
-    df['Date'] = pd.to_datetime(df['Date'])
-    df = df.sort_values('Date')
+    df = load_dataset('monthly')
 
-    # Focus on 2019-2022 for COVID impact
-    recent = df[df['Date'] >= '2019-01-01'].copy()
+    # Focus on 2019 onwards for COVID impact
+    recent = df[df['Date'] >= TRENDS_START]
 
-    # Identify key periods
-    pre_covid = recent[recent['Date'] < '2020-03-01']
-    covid_start = recent[(recent['Date'] >= '2020-03-01') & (recent['Date'] < '2021-01-01')]
-    covid_peak = recent[(recent['Date'] >= '2021-01-01') & (recent['Date'] < '2021-09-01')]
-    post_covid = recent[recent['Date'] >= '2021-09-01']
+    # Assign every month to its COVID_PERIODS entry and aggregate all periods at once
+    edges = [pd.Timestamp(start) for start, _ in COVID_PERIODS.values()] + [pd.Timestamp.max]
+    period = pd.cut(recent['Date'], bins=edges, labels=list(COVID_PERIODS), right=False)
+    stats = recent.groupby(period, observed=True)[['Household', 'Persons', 'Per Household']].agg(['mean', 'max', 'idxmax'])
+    pre_covid = stats.loc['preCovid']
+    covid_peak = stats.loc['covidPeak']
 
     data = {
         'periods': {
             'preCovidAvg': {
-                'households': int(pre_covid['Household'].mean()),
-                'persons': int(pre_covid['Persons'].mean()),
-                'avgBenefitPerHousehold': round(pre_covid['Per Household'].mean(), 2)
+                'households': int(pre_covid['Household', 'mean']),
+                'persons': int(pre_covid['Persons', 'mean']),
+                'avgBenefitPerHousehold': round(pre_covid['Per Household', 'mean'], 2)
             },
             'covidPeak': {
-                'households': int(covid_peak['Household'].max()),
-                'persons': int(covid_peak['Persons'].max()),
-                'avgBenefitPerHousehold': round(covid_peak['Per Household'].max(), 2),
-                'date': covid_peak.loc[covid_peak['Household'].idxmax(), 'Date'].strftime('%Y-%m-%d')
+                'households': int(covid_peak['Household', 'max']),
+                'persons': int(covid_peak['Persons', 'max']),
+                'avgBenefitPerHousehold': round(covid_peak['Per Household', 'max'], 2),
+                'date': df.loc[covid_peak['Household', 'idxmax'], 'Date'].strftime('%Y-%m-%d')
             },
             'latest': {
                 'households': int(recent.iloc[-1]['Household']),
@@ -189,10 +425,10 @@ def process_recent_trends():
         },
         'covidImpact': {
             'peakIncrease': {
-                'households': int(covid_peak['Household'].max() - pre_covid['Household'].mean()),
-                'householdsPercent': round((covid_peak['Household'].max() - pre_covid['Household'].mean()) / pre_covid['Household'].mean() * 100, 2),
-                'persons': int(covid_peak['Persons'].max() - pre_covid['Persons'].mean()),
-                'personsPercent': round((covid_peak['Persons'].max() - pre_covid['Persons'].mean()) / pre_covid['Persons'].mean() * 100, 2)
+                'households': int(covid_peak['Household', 'max'] - pre_covid['Household', 'mean']),
+                'householdsPercent': round((covid_peak['Household', 'max'] - pre_covid['Household', 'mean']) / pre_covid['Household', 'mean'] * 100, 2),
+                'persons': int(covid_peak['Persons', 'max'] - pre_covid['Persons', 'mean']),
+                'personsPercent': round((covid_peak['Persons', 'max'] - pre_covid['Persons', 'mean']) / pre_covid['Persons', 'mean'] * 100, 2)
             }
         },
         'recentData': {
@@ -206,36 +442,733 @@ def process_recent_trends():
     return data
 
 
-def main():
-    """Generate all JSON data files for web visualization."""
+def monthly_columns():
+    """MonthlyColumns of the monthly dataset and its rounded derived measures."""
+    df = load_dataset('monthly')
+    derived = derived_measures_table()
 
-    # Create output directory
-    WEB_DIR.mkdir(parents=True, exist_ok=True)
+    return MonthlyColumns(
+        labels=df['Date'].dt.strftime('%Y-%m-%d').tolist(),
+        datasets={key: df[col].tolist() for key, (col, _) in MONTHLY_SERIES.items()},
+        derived={
+            key: {measure: derived[measure, key].tolist() for measure in DERIVED_MEASURES}
+            for key in MONTHLY_SERIES
+        }
+    )
 
-    print("Generating JSON data for web visualization...")
-    print(f"Output directory: {WEB_DIR}")
 
-    # Process each dataset
-    monthly_data = process_monthly_data()
-    county_data = process_county_data()
-    trends_data = process_recent_trends()
+def process_derived_metrics(columns):
+    """Per-month trend measures (derived.json) for dashboard tooltips."""
+    print("Processing derived metrics...")
+
+    return {
+        'labels': columns.labels,
+        'measures': DERIVED_MEASURES,
+        'metrics': columns.derived
+    }
+
+
+def build_series_bundle():
+    """
+    Pack the monthly and county time series into little-endian Int32/Float32
+    column blocks for series.bin. The header (series.json) lists each block's
+    type, byte offset, element count and scale (value = stored / scale), and
+    each group's start month; "<group>/month" blocks hold month offsets from it.
+    County groups are keyed by FIPS ("county/<fips>", names repeat across
+    states) and carry the county name.
+    """
+    import numpy as np
+
+    print("Packing binary series...")
+
+    groups = {'monthly': load_dataset('monthly')}
+    county = load_dataset('county')
+    for fips, county_df in county.groupby('FIPS', sort=True):
+        groups[f"county/{fips}"] = county_df
+
+    header = {'format': 'snap-series', 'version': 2, 'byteOrder': 'little', 'groups': {}, 'series': {}}
+    blocks = []
+    offset = 0
+
+    for group, df in groups.items():
+        months = (df['Date'].dt.year * 12 + df['Date'].dt.month - 1).to_numpy()
+        header['groups'][group] = {'start': df['Date'].iloc[0].strftime('%Y-%m'), 'length': len(df)}
+        if group != 'monthly':
+            header['groups'][group]['name'] = df['County'].iloc[-1]
+
+        columns = {'month': (months - months[0], 'int32')}
+        spec = MONTHLY_SERIES if group == 'monthly' else COUNTY_SERIES
+        columns.update({key: (df[col].to_numpy(), kind) for key, (col, kind) in spec.items()})
+
+        for key, (values, kind) in columns.items():
+            if kind == 'int32' and len(values) and np.abs(values).max() > np.iinfo(np.int32).max:
+                raise ValueError(f"{group}/{key} does not fit in int32")
+
+            block = np.asarray(values).astype(BINARY_TYPES[kind]).tobytes()
+            header['series'][f"{group}/{key}"] = {
+                'type': kind, 'offset': offset, 'length': len(values), 'scale': 1
+            }
+            blocks.append(block)
+            # Every type is 4 bytes wide, so blocks stay aligned for typed-array views
+            offset += len(block)
+
+    header['byteLength'] = offset
+    return header, b''.join(blocks)
+
+
+def lttb_indices(x, ys, threshold):
+    """
+    Largest-Triangle-Three-Buckets over several series sharing one x axis.
+    Each series is scaled to [0, 1] and every bucket keeps the point with the
+    largest summed triangle area, so peaks and troughs survive in all series
+    and they keep common x values. Returns the indices of the kept points.
+    """
+    import numpy as np
+
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype='float64')
+    ys = np.asarray(ys, dtype='float64')
+    span = ys.max(axis=1, keepdims=True) - ys.min(axis=1, keepdims=True)
+    ys = (ys - ys.min(axis=1, keepdims=True)) / np.where(span == 0, 1, span)
+
+    # First and last points are always kept; the rest fall into threshold - 2 buckets
+    edges = (np.arange(threshold - 1) * (n - 2) / (threshold - 2)).astype(int) + 1
+    edges[-1] = n - 1
+
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+
+        # Third vertex: average of the next bucket (the last point for the final bucket)
+        avg_x = x[end:next_end].mean()
+        avg_y = ys[:, end:next_end].mean(axis=1, keepdims=True)
+
+        area = np.abs(
+            (x[a] - avg_x) * (ys[:, start:end] - ys[:, [a]])
+            - (x[a] - x[start:end]) * (avg_y - ys[:, [a]])
+        ).sum(axis=0)
+        a = start + int(area.argmax())
+        selected.append(a)
+
+    selected.append(n - 1)
+    return np.array(selected)
+
+
+def build_lod_series(columns, select=lttb_indices):
+    """
+    Downsample the long-history chart series to each of LOD_LEVELS points with
+    select (lttb_indices or its stdlib counterpart). Only months from
+    CHART_START on are kept, so a level's point count is what the chart
+    draws. Returns the lod.json manifest and {file name: level payload}; each
+    level has monthly.json's labels/datasets shape so charts can use either.
+    """
+    print("Downsampling chart series...")
+
+    start = next(i for i, label in enumerate(columns.labels) if label >= CHART_START)
+    labels = columns.labels[start:]
+    months = [month_number(label) for label in labels]
+    values = {key: columns.datasets[key][start:] for key in LOD_SERIES}
+
+    manifest = {'pixelsPerPoint': LOD_PIXELS_PER_POINT, 'series': LOD_SERIES, 'levels': []}
+    levels = {}
+
+    for points in LOD_LEVELS:
+        keep = [int(i) for i in select(months, [values[key] for key in LOD_SERIES], points)]
+        name = f'lod-{points}.json'
+        levels[name] = {
+            'labels': [labels[i] for i in keep],
+            'datasets': {key: [values[key][i] for i in keep] for key in LOD_SERIES}
+        }
+        manifest['levels'].append({'points': len(keep), 'file': name})
+
+    # Full resolution, still without the metrics the charts do not plot
+    levels[LOD_FULL] = {'labels': labels, 'datasets': values}
+    manifest['levels'].append({'points': len(labels), 'file': LOD_FULL})
+    return manifest, levels
+
+
+def build_shards(monthly_data, county_data, columns):
+    """
+    Split the dashboard data into files each tab can fetch on its own: the
+    headline summary, one file per decade of monthly values, one per decade of
+    their derived trend measures (tooltips only, so never on the way to a
+    chart), the county snapshot and one file per county's time series.
+    Returns the shards/index.json manifest and {path: payload}, paths being
+    relative to WEB_DIR.
+    """
+    print("Sharding web data...")
+
+    summary_path = f'{SHARD_DIR}/summary.json'
+    counties_path = f'{SHARD_DIR}/counties.json'
+    shards = {
+        summary_path: {key: monthly_data[key] for key in ('metadata', 'summary', 'yearOverYear')},
+        counties_path: {key: value for key, value in county_data.items() if key != 'timeSeries'}
+    }
+
+    # Labels are in date order, so each decade is one contiguous run of rows
+    decades = []
+    positions = range(len(columns.labels))
+    for decade, rows in groupby(positions, key=lambda i: int(columns.labels[i][:4]) // 10 * 10):
+        rows = list(rows)
+        window = slice(rows[0], rows[-1] + 1)
+        name = f'{decade}s'
+        path = f'{SHARD_DIR}/monthly-{name}.json'
+        derived_path = f'{SHARD_DIR}/derived-{name}.json'
+        labels = columns.labels[window]
+        shards[path] = {
+            'decade': name,
+            'labels': labels,
+            'datasets': {key: values[window] for key, values in columns.datasets.items()}
+        }
+        shards[derived_path] = {
+            'decade': name,
+            'labels': labels,
+            'derived': {
+                key: {measure: values[window] for measure, values in measures.items()}
+                for key, measures in columns.derived.items()
+            }
+        }
+        decades.append({'decade': name, 'start': labels[0], 'end': labels[-1],
+                        'file': path, 'derived': derived_path})
+
+    # process_county_data() lists counties and their time series in the same order
+    counties = []
+    for county, series in zip(county_data['counties'], county_data['timeSeries'].values()):
+        path = f"{SHARD_DIR}/county-{county['fips']}.json"
+        shards[path] = {'name': county['name'], 'fips': county['fips'], **series}
+        counties.append({'name': county['name'], 'fips': county['fips'], 'file': path})
+
+    chart_decades = [decade for decade in decades if decade['end'] >= CHART_START]
+    monthly = [decade['file'] for decade in chart_decades]
+    derived = [decade['derived'] for decade in chart_decades]
+    # 'monthly' is only fetched by tabs with a 'lod' series if lod.json is unavailable
+    index = {
+        'version': 2,
+        'tabs': {
+            'overview': {'summary': summary_path, 'lod': 'lod.json', 'monthly': monthly, 'derived': derived},
+            'trends': {'summary': summary_path, 'lod': 'lod.json', 'monthly': monthly, 'derived': derived},
+            # series.json + series.bin (build_series_bundle), mapped into typed arrays
+            'benefits': {'bundle': 'series', 'derived': derived},
+            'covid': {'trends': 'trends.json'},
+            'counties': {'counties': counties_path}
+        },
+        'decades': decades,
+        'counties': counties
+    }
+    return index, shards
+
+
+# Stdlib engine: the same stages on plain lists read with the csv module, so
+# the deploy build needs neither pandas nor numpy. Outputs must stay
+# byte-identical to the pandas engine, so the helpers below reproduce numpy's
+# pairwise summation and rounding and pandas' compensated group and rolling means.
+
+def pairwise_sum(values):
+    """Float sum in numpy's order (pairwise over blocks of 128, eight accumulators)."""
+    n = len(values)
+    if n < 8:
+        total = 0.0
+        for value in values:
+            total += value
+        return total
+
+    if n <= 128:
+        partial = list(values[:8])
+        i = 8
+        while i < n - n % 8:
+            for j in range(8):
+                partial[j] += values[i + j]
+            i += 8
+        total = ((partial[0] + partial[1]) + (partial[2] + partial[3])) + \
+                ((partial[4] + partial[5]) + (partial[6] + partial[7]))
+        for value in values[i:]:
+            total += value
+        return total
+
+    half = n // 2
+    half -= half % 8
+    return pairwise_sum(values[:half]) + pairwise_sum(values[half:])
+
+
+def numpy_mean(values):
+    """Series.mean() / ndarray.mean() of floats."""
+    return pairwise_sum([float(value) for value in values]) / len(values)
+
+
+def compensated_mean(values):
+    """GroupBy.mean(): Kahan-compensated sum over the group's rows."""
+    total = compensation = 0.0
+    for value in values:
+        y = value - compensation
+        t = total + y
+        compensation = t - total - y
+        total = t
+    return total / len(values)
+
+
+def numpy_round(value, decimals=2):
+    """np.round(): scale, round half to even, scale back (not the same as round(value, decimals))."""
+    scale = 10.0 ** decimals
+    return round(value * scale) / scale
+
+
+def rolling_mean(values, window):
+    """
+    Series.rolling(window).mean() with None for missing values: a sliding
+    Kahan-compensated sum (removals before additions), None until window
+    values are present, and the repeated value itself over constant runs.
+    """
+    result = []
+    total = add_compensation = remove_compensation = 0.0
+    count = negatives = repeats = 0
+    previous = values[0] if values else None
+
+    for i, value in enumerate(values):
+        if i >= window and values[i - window] is not None:
+            removed = values[i - window]
+            count -= 1
+            y = -removed - remove_compensation
+            t = total + y
+            remove_compensation = t - total - y
+            total = t
+            negatives -= math.copysign(1, removed) < 0
+
+        if value is not None:
+            count += 1
+            y = value - add_compensation
+            t = total + y
+            add_compensation = t - total - y
+            total = t
+            negatives += math.copysign(1, value) < 0
+            repeats = repeats + 1 if value == previous else 1
+            previous = value
+
+        if count < window:
+            result.append(None)
+        elif repeats >= count:
+            result.append(previous)
+        elif negatives == 0 and total / count < 0:
+            result.append(0.0)
+        elif negatives == count and total / count > 0:
+            result.append(0.0)
+        else:
+            result.append(total / count)
+
+    return result
+
+
+def percent_change(values, periods):
+    """(value / value periods earlier - 1) * 100, None where either is missing or the base is zero."""
+    return [
+        None if i < periods or value is None or values[i - periods] in (None, 0)
+        else (value / values[i - periods] - 1) * 100
+        for i, value in enumerate(values)
+    ]
+
+
+@lru_cache(maxsize=None)
+def read_dataset(name):
+    """
+    Stdlib counterpart of load_dataset(): {column: list} with the DATASETS
+    types, dates as 'YYYY-MM-DD' strings (None when invalid) and rows in the
+    same order. Stages must not modify the lists in place.
+    """
+    spec = DATASETS[name]
+    converters = {
+        'int64': int,
+        'float64': lambda text: float(text) if text else None,
+        'string': str
+    }
+
+    with PROFILE.stage(f"load {name}") as stage:
+        with open(DATA_DIR / spec['file'], newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            rows = list(reader)
+
+        columns = {col: [row[i] for row in rows] for i, col in enumerate(header)}
+        for col, dtype in spec['dtypes'].items():
+            columns[col] = [converters[dtype](text) for text in columns[col]]
+        for col in spec['dates']:
+            columns[col] = [text if ISO_DATE.match(text) else None for text in columns[col]]
+
+        # Stable sort with missing values last, as sort_values() does
+        def sort_key(i):
+            return tuple((1, 0) if columns[col][i] is None else (0, columns[col][i]) for col in spec['sort'])
+
+        order = sorted(range(len(rows)), key=sort_key)
+        columns = {col: [values[i] for i in order] for col, values in columns.items()}
+        stage.rows = len(rows)
+
+    return columns
+
+
+@lru_cache(maxsize=None)
+def derive_monthly_metrics_stdlib():
+    """
+    Stdlib counterpart of derive_monthly_metrics():
+    {measure: {metric: values}} for 'yearAgo' and DERIVED_MEASURES, one value
+    (or None) per source row, computed on the complete month index.
+    """
+    table = read_dataset('monthly')
+    months = [month_number(label) for label in table['Date']]
+    positions = [month - months[0] for month in months]
+
+    derived = {measure: {} for measure in ['yearAgo'] + DERIVED_MEASURES}
+    for key, (col, _) in MONTHLY_SERIES.items():
+        aligned = [None] * (positions[-1] + 1)
+        for position, value in zip(positions, table[col]):
+            aligned[position] = float(value)
+
+        first = aligned[0]
+        measures = {
+            'yearAgo': [None] * 12 + aligned[:-12],
+            'yoy': percent_change(aligned, 12),
+            'mom': percent_change(aligned, 1),
+            'rolling3': rolling_mean(aligned, 3),
+            'rolling12': rolling_mean(aligned, 12),
+            'cumulative': [None if value is None else (value / first - 1) * 100 for value in aligned]
+        }
+        for measure, values in measures.items():
+            derived[measure][key] = [values[position] for position in positions]
+
+    return derived
+
+
+def monthly_columns_stdlib():
+    """Stdlib counterpart of monthly_columns()."""
+    table = read_dataset('monthly')
+    derived = derive_monthly_metrics_stdlib()
+
+    return MonthlyColumns(
+        labels=list(table['Date']),
+        datasets={key: list(table[col]) for key, (col, _) in MONTHLY_SERIES.items()},
+        derived={
+            key: {
+                measure: [None if value is None else numpy_round(value) for value in derived[measure][key]]
+                for measure in DERIVED_MEASURES
+            }
+            for key in MONTHLY_SERIES
+        }
+    )
+
+
+def process_monthly_data_stdlib():
+    """Stdlib counterpart of process_monthly_data()."""
+    print("Processing monthly data...")
+
+    table = read_dataset('monthly')
+    labels = table['Date']
+
+    def peak(col):
+        values = table[col]
+        value = max(values)
+        return {'value': value, 'date': labels[values.index(value)]}
+
+    data = {
+        'labels': list(labels),
+        'datasets': {key: list(table[col]) for key, (col, _) in MONTHLY_SERIES.items()},
+        'metadata': {
+            'startDate': min(labels),
+            'endDate': max(labels),
+            'totalMonths': len(labels),
+            'latestHouseholds': table['Household'][-1],
+            'latestPersons': table['Persons'][-1],
+            'latestAvgBenefitPerHousehold': table['Per Household'][-1],
+            'latestAvgBenefitPerPerson': table['Per Person'][-1],
+            'latestTotalCost': table['Cost'][-1]
+        }
+    }
+
+    data['summary'] = {
+        'peak': {
+            'households': peak('Household'),
+            'persons': peak('Persons'),
+            'avgBenefitPerHousehold': peak('Per Household'),
+            'totalCost': peak('Cost')
+        },
+        'averages': {
+            'households': int(numpy_mean(table['Household'])),
+            'persons': int(numpy_mean(table['Persons'])),
+            'avgBenefitPerHousehold': numpy_round(numpy_mean(table['Per Household'])),
+            'avgBenefitPerPerson': numpy_round(numpy_mean(table['Per Person'])),
+            'totalCost': int(numpy_mean(table['Cost']))
+        }
+    }
+
+    derived = derive_monthly_metrics_stdlib()
+    data['yearOverYear'] = {}
+    for key in ('households', 'persons'):
+        current = table[MONTHLY_SERIES[key][0]][-1]
+        year_ago = derived['yearAgo'][key][-1]
+        if year_ago is None:
+            data['yearOverYear'][key] = None
+            continue
+        data['yearOverYear'][key] = {
+            'current': int(current),
+            'yearAgo': int(year_ago),
+            'change': int(current - year_ago),
+            'percentChange': numpy_round((current - year_ago) / year_ago * 100)
+        }
+
+    return data
+
+
+def process_county_data_stdlib():
+    """Stdlib counterpart of process_county_data()."""
+    print("Processing county data...")
 
-    # Save to JSON files
-    with open(WEB_DIR / 'monthly.json', 'w') as f:
-        json.dump(monthly_data, f, indent=2)
-    print(f"✓ Saved monthly.json")
+    table = read_dataset('county')
+    persons_col = 'Calc: SNAP Total PA and Non-PA People'
+    households_col = 'Calc: SNAP Total PA and Non-PA Households'
+    issuance_col = 'SNAP All Total Actual PA & Non-PA Issuance'
+    dates = table['Date']
 
-    with open(WEB_DIR / 'county.json', 'w') as f:
-        json.dump(county_data, f, indent=2)
-    print(f"✓ Saved county.json")
+    # Row positions per FIPS in first-appearance (date) order
+    groups = {}
+    for i, fips in enumerate(table['FIPS']):
+        groups.setdefault(fips, []).append(i)
 
-    with open(WEB_DIR / 'trends.json', 'w') as f:
-        json.dump(trends_data, f, indent=2)
-    print(f"✓ Saved trends.json")
+    latest_date = max(date for date in dates if date is not None)
+    latest = sorted(rows[-1] for rows in groups.values() if dates[rows[-1]] == latest_date)
 
-    # Create a combined metadata file
-    metadata = {
-        'generated': datetime.now().isoformat(),
+    data = {
+        'asOfDate': latest_date,
+        'counties': []
+    }
+
+    names = [table['County'][i] for i in latest]
+    name_counts = {}
+    for name in names:
+        name_counts[name] = name_counts.get(name, 0) + 1
+
+    counties_over_time = {}
+    for i, name in zip(latest, names):
+        fips = table['FIPS'][i]
+        data['counties'].append({
+            'name': name,
+            'fips': fips,
+            'persons': {
+                'publicAssistance': table['SNAP All Persons Public Assistance Participation'][i],
+                'nonPublicAssistance': table['SNAP All Persons Non-Public Assistance Participation'][i],
+                'total': table[persons_col][i]
+            },
+            'households': {
+                'publicAssistance': table['SNAP All Households Public Assistance Participation'][i],
+                'nonPublicAssistance': table['SNAP All Households Non-Public Assistance Participation'][i],
+                'total': table[households_col][i]
+            },
+            'totalIssuance': table[issuance_col][i]
+        })
+
+        key = f"{name}, {table['State'][i]}" if name_counts[name] > 1 else name
+        rows = groups[fips]
+        counties_over_time[key] = {
+            'dates': [dates[j] for j in rows],
+            'persons': [table[persons_col][j] for j in rows],
+            'households': [table[households_col][j] for j in rows]
+        }
+
+    state_totals = {}
+    for i in latest:
+        totals = state_totals.setdefault(table['State'][i], {'persons': 0, 'households': 0, 'totalIssuance': 0})
+        totals['persons'] += table[persons_col][i]
+        totals['households'] += table[households_col][i]
+        totals['totalIssuance'] += table[issuance_col][i]
+
+    data['stateTotal'] = {
+        key: sum(totals[key] for totals in state_totals.values())
+        for key in ('persons', 'households', 'totalIssuance')
+    }
+    if len(state_totals) > 1:
+        data['stateTotals'] = {state: state_totals[state] for state in sorted(state_totals)}
+
+    data['timeSeries'] = counties_over_time
+
+    return data
+
+
+def process_recent_trends_stdlib():
+    """Stdlib counterpart of process_recent_trends()."""
+    print("Processing recent trends...")
+
+    table = read_dataset('monthly')
+    recent = [i for i, date in enumerate(table['Date']) if date >= TRENDS_START]
+
+    # Rows of each COVID_PERIODS entry: from its start up to the next period's start
+    starts = [start for start, _ in COVID_PERIODS.values()]
+    periods = {}
+    for i in recent:
+        index = sum(start <= table['Date'][i] for start in starts) - 1
+        if index >= 0:
+            periods.setdefault(list(COVID_PERIODS)[index], []).append(i)
+
+    def mean(period, col):
+        return compensated_mean([float(table[col][i]) for i in periods[period]])
+
+    def peak(period, col):
+        return max(table[col][i] for i in periods[period])
+
+    pre_covid = {col: mean('preCovid', col) for col in ('Household', 'Persons', 'Per Household')}
+    covid_peak = {col: float(peak('covidPeak', col)) for col in ('Household', 'Persons', 'Per Household')}
+    peak_row = next(i for i in periods['covidPeak'] if table['Household'][i] == covid_peak['Household'])
+    last = recent[-1]
+
+    data = {
+        'periods': {
+            'preCovidAvg': {
+                'households': int(pre_covid['Household']),
+                'persons': int(pre_covid['Persons']),
+                'avgBenefitPerHousehold': numpy_round(pre_covid['Per Household'])
+            },
+            'covidPeak': {
+                'households': int(covid_peak['Household']),
+                'persons': int(covid_peak['Persons']),
+                'avgBenefitPerHousehold': numpy_round(covid_peak['Per Household']),
+                'date': table['Date'][peak_row]
+            },
+            'latest': {
+                'households': table['Household'][last],
+                'persons': table['Persons'][last],
+                'avgBenefitPerHousehold': numpy_round(table['Per Household'][last]),
+                'date': table['Date'][last]
+            }
+        },
+        'covidImpact': {
+            'peakIncrease': {
+                'households': int(covid_peak['Household'] - pre_covid['Household']),
+                'householdsPercent': numpy_round((covid_peak['Household'] - pre_covid['Household']) / pre_covid['Household'] * 100),
+                'persons': int(covid_peak['Persons'] - pre_covid['Persons']),
+                'personsPercent': numpy_round((covid_peak['Persons'] - pre_covid['Persons']) / pre_covid['Persons'] * 100)
+            }
+        },
+        'recentData': {
+            'labels': [table['Date'][i] for i in recent],
+            'households': [table['Household'][i] for i in recent],
+            'persons': [table['Persons'][i] for i in recent],
+            'avgBenefitPerHousehold': [table['Per Household'][i] for i in recent]
+        }
+    }
+
+    return data
+
+
+def build_series_bundle_stdlib():
+    """Stdlib counterpart of build_series_bundle(), packing with the array module."""
+    print("Packing binary series...")
+
+    groups = {'monthly': read_dataset('monthly')}
+    county = read_dataset('county')
+    # Row positions per FIPS in one pass, in date order like pandas' groupby
+    county_rows = {}
+    for i, fips in enumerate(county['FIPS']):
+        county_rows.setdefault(fips, []).append(i)
+    for fips in sorted(county_rows):
+        rows = county_rows[fips]
+        groups[f"county/{fips}"] = {col: [values[i] for i in rows] for col, values in county.items()}
+
+    header = {'format': 'snap-series', 'version': 2, 'byteOrder': 'little', 'groups': {}, 'series': {}}
+    blocks = []
+    offset = 0
+
+    for group, table in groups.items():
+        months = [month_number(date) for date in table['Date']]
+        header['groups'][group] = {'start': table['Date'][0][:7], 'length': len(months)}
+        if group != 'monthly':
+            header['groups'][group]['name'] = table['County'][-1]
+
+        columns = {'month': ([month - months[0] for month in months], 'int32')}
+        spec = MONTHLY_SERIES if group == 'monthly' else COUNTY_SERIES
+        columns.update({key: (table[col], kind) for key, (col, kind) in spec.items()})
+
+        for key, (values, kind) in columns.items():
+            if kind == 'int32' and values and max(abs(value) for value in values) > 2 ** 31 - 1:
+                raise ValueError(f"{group}/{key} does not fit in int32")
+
+            packed = array(ARRAY_TYPES[kind], values)
+            if sys.byteorder == 'big':
+                packed.byteswap()
+            block = packed.tobytes()
+            header['series'][f"{group}/{key}"] = {
+                'type': kind, 'offset': offset, 'length': len(values), 'scale': 1
+            }
+            blocks.append(block)
+            offset += len(block)
+
+    header['byteLength'] = offset
+    return header, b''.join(blocks)
+
+
+def lttb_indices_stdlib(x, ys, threshold):
+    """Stdlib counterpart of lttb_indices(), with the same floating-point operation order."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    x = [float(value) for value in x]
+    scaled = []
+    for series in ys:
+        series = [float(value) for value in series]
+        low = min(series)
+        span = max(series) - low
+        scaled.append([(value - low) / (span if span != 0 else 1) for value in series])
+
+    edges = [int(i * (n - 2) / (threshold - 2)) + 1 for i in range(threshold - 1)]
+    edges[-1] = n - 1
+
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+
+        avg_x = pairwise_sum(x[end:next_end]) / (next_end - end)
+        avg_ys = [pairwise_sum(series[end:next_end]) / (next_end - end) for series in scaled]
+
+        areas = [
+            sum(abs((x[a] - avg_x) * (series[j] - series[a]) - (x[a] - x[j]) * (avg_y - series[a]))
+                for series, avg_y in zip(scaled, avg_ys))
+            for j in range(start, end)
+        ]
+        a = start + areas.index(max(areas))
+        selected.append(a)
+
+    selected.append(n - 1)
+    return selected
+
+
+# Engine-specific stages. There is no fallback between engines: each one
+# must define every stage, and the stdlib stages never import pandas
+ENGINES = {
+    'pandas': {
+        'monthly': process_monthly_data,
+        'county': process_county_data,
+        'trends': process_recent_trends,
+        'columns': monthly_columns,
+        'series': build_series_bundle,
+        'lttb': lttb_indices
+    },
+    'stdlib': {
+        'monthly': process_monthly_data_stdlib,
+        'county': process_county_data_stdlib,
+        'trends': process_recent_trends_stdlib,
+        'columns': monthly_columns_stdlib,
+        'series': build_series_bundle_stdlib,
+        'lttb': lttb_indices_stdlib
+    }
+}
+
+
+def build_metadata(monthly_data):
+    """Combined metadata file describing the generated data."""
+    return {
+        # Derived from the data rather than the clock so rebuilds are byte-identical
+        'generated': f"{monthly_data['metadata']['endDate']}T00:00:00",
         'dataVersion': '2022-01',
         'note': 'Data current through January 2022. Updated data available through May 2025.',
         'sources': {
@@ -246,19 +1179,444 @@ def main():
         'summary': monthly_data['metadata']
     }
 
-    with open(WEB_DIR / 'metadata.json', 'w') as f:
-        json.dump(metadata, f, indent=2)
-    print(f"✓ Saved metadata.json")
+
+def month_number(iso_date):
+    """Months since year 0 for a 'YYYY-MM-01' date."""
+    return int(iso_date[:4]) * 12 + int(iso_date[5:7]) - 1
+
+
+def encode_compact(value):
+    """
+    Columnar compact encoding of a JSON payload, expanded again by
+    decodeCompact() in web/app.js:
+    - lists of first-of-month dates -> {"$months": {"start": "YYYY-MM", "offsets": [...]}},
+      or {"start", "count"} when the months are consecutive
+    - lists of objects sharing the same keys -> {"$table": {key: column, ...}}
+    """
+    if isinstance(value, dict):
+        return {key: encode_compact(item) for key, item in value.items()}
+
+    if isinstance(value, list):
+        if len(value) > 1 and all(isinstance(item, str) and ISO_MONTH.match(item) for item in value):
+            start = month_number(value[0])
+            offsets = [month_number(item) - start for item in value]
+            encoded = {'start': value[0][:7]}
+            if offsets == list(range(len(offsets))):
+                encoded['count'] = len(offsets)
+            else:
+                encoded['offsets'] = offsets
+            return {'$months': encoded}
+
+        if len(value) > 1 and all(isinstance(item, dict) for item in value):
+            keys = list(value[0])
+            if all(list(item) == keys for item in value):
+                return {'$table': {key: encode_compact([item[key] for item in value]) for key in keys}}
+
+        return [encode_compact(item) for item in value]
+
+    return value
+
+
+def decode_compact(value):
+    """Inverse of encode_compact(), as decodeCompact() in web/app.js; plain JSON passes through."""
+    if isinstance(value, list):
+        return [decode_compact(item) for item in value]
+
+    if not isinstance(value, dict):
+        return value
+
+    if '$months' in value:
+        months = value['$months']
+        start = month_number(f"{months['start']}-01")
+        offsets = months.get('offsets') or range(months.get('count', 0))
+        return [f"{(start + offset) // 12}-{(start + offset) % 12 + 1:02d}-01" for offset in offsets]
+
+    if '$table' in value:
+        columns = {key: decode_compact(column) for key, column in value['$table'].items()}
+        length = len(next(iter(columns.values()), []))
+        return [{key: column[i] for key, column in columns.items()} for i in range(length)]
+
+    return {key: decode_compact(item) for key, item in value.items()}
+
+
+def canonicalize(value):
+    """
+    Plain JSON values independent of the pandas/numpy types they came from:
+    numpy scalars become int/float/bool, floats are rounded to FLOAT_PRECISION
+    (with -0.0 as 0.0) and NaN/inf become None.
+    """
+    if isinstance(value, dict):
+        return {str(key): canonicalize(item) for key, item in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        return [canonicalize(item) for item in value]
+
+    # numpy scalars, without importing numpy
+    if hasattr(value, 'item') and not isinstance(value, str):
+        value = value.item()
+
+    if isinstance(value, bool):
+        return value
+
+    if isinstance(value, int):
+        return int(value)
+
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+        return round(float(value), FLOAT_PRECISION) + 0.0
+
+    return value
+
+
+def serialize_json(data, compact=False):
+    """
+    Canonical bytes of a JSON output: canonicalized values, sorted keys and
+    fixed separators, so identical inputs always give identical bytes.
+    """
+    if compact:
+        text = json.dumps(canonicalize(encode_compact(data)), separators=(',', ':'),
+                          sort_keys=True, allow_nan=False)
+    else:
+        text = json.dumps(canonicalize(data), indent=2, sort_keys=True, allow_nan=False)
+    return text.encode()
+
+
+def write_if_changed(path, payload):
+    """
+    Write bytes unless the file already holds them, so unchanged outputs keep
+    their modification time as well as their content. Returns True if written.
+    """
+    path = Path(path)
+    try:
+        if path.read_bytes() == payload:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(payload)
+    return True
+
+
+def write_precompressed(path, payload):
+    """
+    Write .gz (and .br when the brotli package is installed) siblings of an output.
+    Without brotli an existing .br is removed, since it would hold an older payload.
+    """
+    write_if_changed(f"{path}.gz", gzip.compress(payload, compresslevel=9, mtime=0))
+
+    try:
+        import brotli
+    except ImportError:
+        Path(f"{path}.br").unlink(missing_ok=True)
+        return
+    write_if_changed(f"{path}.br", brotli.compress(payload, quality=11))
+
+
+def remove_precompressed(path):
+    """Delete the .gz/.br siblings of an output written without them, so none outlive its content."""
+    for suffix in ('.gz', '.br'):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+
+
+def file_sha256(path):
+    """Content hash of a file, or None if it does not exist."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def output_fingerprint(output, encoding='pretty'):
+    """Generator version, encoding and input hashes an output is built from."""
+    return {
+        'generator': GENERATOR_VERSION,
+        'encoding': encoding,
+        'inputs': {
+            DATASETS[name]['file']: file_sha256(DATA_DIR / DATASETS[name]['file'])
+            for name in OUTPUTS[output]
+        }
+    }
+
+
+def load_build_manifest():
+    try:
+        with open(BUILD_MANIFEST) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_build_manifest(manifest):
+    BUILD_MANIFEST.parent.mkdir(parents=True, exist_ok=True)
+    with open(BUILD_MANIFEST, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def find_stale_outputs(manifest, encoding='pretty'):
+    """Outputs whose inputs, generator version, encoding or file contents changed since the last build."""
+    stale = []
+    for output in OUTPUTS:
+        entry = manifest.get(output)
+        fingerprint = output_fingerprint(output, encoding)
+        if (entry is None
+                or {k: entry.get(k) for k in fingerprint} != fingerprint
+                or entry.get('output') != file_sha256(WEB_DIR / output)
+                or any(file_sha256(WEB_DIR / name) != digest
+                       for name, digest in entry.get('files', {}).items())):
+            stale.append(output)
+    return stale
+
+
+def hashed_name(name, digest):
+    """'shards/summary.json' -> 'shards/summary.<digest>.json'."""
+    path = PurePosixPath(name)
+    return str(path.with_name(f"{path.stem}.{digest[:ASSET_HASH_LENGTH]}{path.suffix}"))
+
+
+def publish_hashed_assets(manifest, compact=False):
+    """
+    Copy every output (and shard) to ASSET_DIR under a content-hashed name and
+    write data/manifest.json pointing at the copies, with the INLINE_OUTPUTS
+    embedded. Existing copies are kept; ones referenced by neither this
+    generation nor the previous one (see ASSET_HISTORY) are removed.
+    The .gz/.br siblings are copied too in compact mode, where every output
+    was written with them.
+    """
+    names = list(OUTPUTS) + list(manifest.get(SHARD_INDEX, {}).get('files', {}))
+    history = load_asset_history()
+    files = {}
+    keep = set()
+
+    for name in names:
+        digest = file_sha256(WEB_DIR / name)
+        if digest is None:
+            continue
+        target = hashed_name(name, digest)
+        files[name] = f"{ASSET_DIR.name}/{target}"
+
+        copies = [('', '')] + ([('.gz', '.gz'), ('.br', '.br')] if compact else [])
+        for source_suffix, target_suffix in copies:
+            source = WEB_DIR / f"{name}{source_suffix}"
+            copy = ASSET_DIR / f"{target}{target_suffix}"
+            if not source.exists():
+                continue
+            keep.add(copy)
+            if not copy.exists():
+                copy.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(source, copy)
+
+    current = sorted(copy.relative_to(ASSET_DIR).as_posix() for copy in keep)
+    if current != history['current']:
+        history = {'current': current, 'previous': history['current']}
+    keep.update(ASSET_DIR / name for name in history['previous'])
+
+    for path in sorted(ASSET_DIR.rglob('*'), reverse=True):
+        if path.is_file() and path not in keep:
+            path.unlink()
+        elif path.is_dir() and not any(path.iterdir()):
+            path.rmdir()
+
+    inline = {
+        name: decode_compact(json.loads((WEB_DIR / name).read_bytes()))
+        for name in INLINE_OUTPUTS if (WEB_DIR / name).exists()
+    }
+    save_json(ASSET_MANIFEST, {'version': 1, 'files': files, 'inline': inline}, compact)
+    save_asset_history(history)
+
+
+def load_asset_history():
+    """
+    ASSET_HISTORY as {'current': [...], 'previous': [...]}. Without one, every
+    copy already in ASSET_DIR counts as the current generation, so the first
+    build that changes an output keeps them as the previous one.
+    """
+    try:
+        with open(ASSET_HISTORY) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        existing = [path.relative_to(ASSET_DIR).as_posix() for path in ASSET_DIR.rglob('*') if path.is_file()]
+        return {'current': sorted(existing), 'previous': []}
+
+
+def save_asset_history(history):
+    ASSET_HISTORY.parent.mkdir(parents=True, exist_ok=True)
+    with open(ASSET_HISTORY, 'w') as f:
+        json.dump(history, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def save_json(name, data, compact=False):
+    path = WEB_DIR / name
+    payload = serialize_json(data, compact)
+    written = write_if_changed(path, payload)
+
+    if not compact:
+        remove_precompressed(path)
+        print(f"✓ Saved {name}" if written else f"✓ {name} unchanged")
+        return
+
+    write_precompressed(path, payload)
+    print(f"✓ Saved {name} ({len(payload):,} bytes, compact + precompressed)"
+          if written else f"✓ {name} unchanged ({len(payload):,} bytes)")
+
+
+def save_binary(name, payload, compact=False):
+    path = WEB_DIR / name
+    write_if_changed(path, payload)
+    if compact:
+        write_precompressed(path, payload)
+    else:
+        remove_precompressed(path)
+    print(f"✓ Saved {name} ({len(payload):,} bytes)")
+
+
+def main():
+    """Generate all JSON data files for web visualization."""
+    parser = argparse.ArgumentParser(description="Generate JSON data for the web dashboard")
+    parser.add_argument('--force', action='store_true',
+                        help='Regenerate every output even if its inputs are unchanged')
+    parser.add_argument('--compact', action='store_true',
+                        help='Write minified columnar JSON with .gz/.br siblings')
+    parser.add_argument('--profile', action='store_true',
+                        help=f'Trace per-stage memory and save cProfile stats to {CPU_PROFILE.name}')
+    parser.add_argument('--engine', choices=list(ENGINES), default='stdlib',
+                        help='Stage implementations: stdlib (csv module, no pandas import) or pandas; '
+                             'both write byte-identical outputs')
+    args = parser.parse_args()
+
+    PROFILE.start(cpu=args.profile, trace_memory=args.profile)
+    try:
+        generate(args)
+    finally:
+        PROFILE.stop()
+        PROFILE.write(BUILD_PROFILE)
+        PROFILE.print_summary()
+        print(f"Build profile saved to: {BUILD_PROFILE}")
+        if args.profile:
+            PROFILE.dump_stats(CPU_PROFILE)
+
+
+def generate(args):
+    encoding = 'compact' if args.compact else 'pretty'
+    stages = ENGINES[args.engine]
+
+    # Create output directory
+    WEB_DIR.mkdir(parents=True, exist_ok=True)
+
+    print("Generating JSON data for web visualization...")
+    print(f"Output directory: {WEB_DIR}")
+    print(f"Engine: {args.engine}")
+
+    with PROFILE.stage('check manifest') as stage:
+        manifest = {} if args.force else load_build_manifest()
+        stale = find_stale_outputs(manifest, encoding)
+        stage.rows = len(OUTPUTS)
+
+    for output in OUTPUTS:
+        if output not in stale:
+            print(f"- {output} is up to date")
+
+    if not stale:
+        print("\nNothing to regenerate.")
+        with PROFILE.stage('publish assets'):
+            publish_hashed_assets(manifest, args.compact)
+        return
+
+    # Process only the datasets behind stale outputs
+    monthly_data = None
+    if 'monthly.json' in stale or 'metadata.json' in stale or SHARD_INDEX in stale:
+        with PROFILE.stage('monthly') as stage:
+            monthly_data = stages['monthly']()
+            stage.rows = len(monthly_data['labels'])
+
+    if 'monthly.json' in stale:
+        with PROFILE.stage('write monthly.json'):
+            save_json('monthly.json', monthly_data, args.compact)
+
+    county_data = None
+    if 'county.json' in stale or SHARD_INDEX in stale:
+        with PROFILE.stage('county') as stage:
+            county_data = stages['county']()
+            stage.rows = len(county_data['counties'])
+
+    if 'county.json' in stale:
+        with PROFILE.stage('write county.json'):
+            save_json('county.json', county_data, args.compact)
+
+    if 'trends.json' in stale:
+        with PROFILE.stage('trends.json') as stage:
+            trends_data = stages['trends']()
+            stage.rows = len(trends_data['recentData']['labels'])
+            save_json('trends.json', trends_data, args.compact)
+
+    # Monthly series and derived measures as plain lists for derived.json, lod and shards
+    columns = None
+    if 'derived.json' in stale or SHARD_INDEX in stale or any(output.startswith('lod') for output in stale):
+        with PROFILE.stage('monthly columns') as stage:
+            columns = stages['columns']()
+            stage.rows = len(columns.labels)
+
+    if 'derived.json' in stale:
+        with PROFILE.stage('derived.json') as stage:
+            derived_data = process_derived_metrics(columns)
+            stage.rows = len(derived_data['labels'])
+            save_json('derived.json', derived_data, args.compact)
+
+    if 'metadata.json' in stale:
+        with PROFILE.stage('metadata.json'):
+            save_json('metadata.json', build_metadata(monthly_data), args.compact)
+
+    if 'series.json' in stale or 'series.bin' in stale:
+        with PROFILE.stage('series.bin') as stage:
+            series_header, series_payload = stages['series']()
+            stage.rows = len(series_header['series'])
+            save_binary('series.bin', series_payload, args.compact)
+            save_json('series.json', series_header, args.compact)
+
+    if any(output.startswith('lod') for output in stale):
+        with PROFILE.stage('lod') as stage:
+            lod_manifest, lod_levels = build_lod_series(columns, stages['lttb'])
+            stage.rows = len(lod_levels)
+            for name, level in lod_levels.items():
+                save_json(name, level, args.compact)
+            save_json('lod.json', lod_manifest, args.compact)
+
+    shard_files = []
+    if SHARD_INDEX in stale:
+        with PROFILE.stage('shards') as stage:
+            shard_index, shards = build_shards(monthly_data, county_data, columns)
+            stage.rows = len(shards)
+            # Shard names follow the data (decades, counties), so drop the old set
+            shutil.rmtree(WEB_DIR / SHARD_DIR, ignore_errors=True)
+            (WEB_DIR / SHARD_DIR).mkdir()
+            for name, shard in shards.items():
+                save_json(name, shard, args.compact)
+            save_json(SHARD_INDEX, shard_index, args.compact)
+            shard_files = list(shards)
+
+    with PROFILE.stage('save manifest') as stage:
+        for output in stale:
+            manifest[output] = {**output_fingerprint(output, encoding), 'output': file_sha256(WEB_DIR / output)}
+            if output == SHARD_INDEX:
+                manifest[output]['files'] = {name: file_sha256(WEB_DIR / name) for name in shard_files}
+        save_build_manifest(manifest)
+        stage.rows = len(stale)
+
+    with PROFILE.stage('publish assets'):
+        publish_hashed_assets(manifest, args.compact)
 
     print("\n" + "="*60)
     print("JSON data generation complete!")
     print("="*60)
     print(f"\nFiles created in: {WEB_DIR}")
     print("\nKey statistics:")
-    print(f"  Latest participation: {monthly_data['metadata']['latestPersons']:,} persons")
-    print(f"  Latest households: {monthly_data['metadata']['latestHouseholds']:,}")
-    print(f"  Date range: {monthly_data['metadata']['startDate']} to {monthly_data['metadata']['endDate']}")
-    print(f"  Total counties: {len(county_data['counties'])}")
+    if monthly_data:
+        print(f"  Latest participation: {monthly_data['metadata']['latestPersons']:,} persons")
+        print(f"  Latest households: {monthly_data['metadata']['latestHouseholds']:,}")
+        print(f"  Date range: {monthly_data['metadata']['startDate']} to {monthly_data['metadata']['endDate']}")
+    if county_data:
+        print(f"  Total counties: {len(county_data['counties'])}")
 
 
 if __name__ == "__main__":
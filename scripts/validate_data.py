@@ -8,190 +8,864 @@ Validates data quality and identifies issues in SNAP datasets.
 Usage:
     python validate_data.py --all
     python validate_data.py --file "Data/Statewide Monthly SNAP FY 89-22.csv"
+    python validate_data.py --file retailers.zip --chunksize 200000
+    python validate_data.py --all --jobs 4
+    python validate_data.py --all --full
+    python validate_data.py --all --results validation.jsonl
 """
 
 import argparse
+import copy
+import hashlib
+import io
+import json
+import os
+import time
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
 import pandas as pd
 import numpy as np
-from datetime import datetime
+from datetime import datetime, timezone
 
 DATA_DIR = Path(__file__).parent.parent / "Data"
 
+# Bump whenever a check's statistics change so cached part stats are recomputed
+VALIDATOR_VERSION = 3
+
+# Per-file watermark: the parts validated last time, their hashes and stats
+CACHE_FILE = DATA_DIR / ".cache" / "validation_cache.json"
+
+# Hawaii coordinate bounds: 18°-23°N, 154°-161°W
+HI_BOUNDS = {'lat': (18, 23), 'lon': (-161, -154)}
+# Calculated total and the two columns it should equal the sum of
+TOTAL_COLUMNS = (
+    'Calc: SNAP Total PA and Non-PA People',
+    'SNAP All Persons Public Assistance Participation',
+    'SNAP All Persons Non-Public Assistance Participation',
+)
+GAP_NS = pd.Timedelta(days=60).value
+# With --jobs, plain CSV files are split into parts of about this size
+PART_BYTES = 32 * 2 ** 20
+# Rows read up front to resolve auto-detected columns before parts are dispatched
+SAMPLE_ROWS = 1000
+# Positions of affected rows kept per finding
+ROW_SAMPLE = 20
+# Report line prefix per finding severity (info lines carry their own indentation)
+SEVERITY_MARKS = {'error': '✗ ', 'warning': '⚠ ', 'ok': '✓ ', 'info': ''}
+
+
+def open_csv(path):
+    """Open a CSV file, or the first CSV inside a zip archive (as FNS publishes them)."""
+    if path.suffix.lower() != '.zip':
+        return open(path, 'rb')
+    archive = zipfile.ZipFile(path)
+    members = [name for name in archive.namelist() if name.lower().endswith('.csv')]
+    if not members:
+        raise ValueError(f"no CSV file in {path.name}")
+    return archive.open(members[0])
+
+
+def split_csv(path, part_bytes=PART_BYTES, start=None):
+    """
+    Byte ranges (start, end) covering the rows of a plain CSV file (from start,
+    or the first row), cut at line ends into parts of about part_bytes. Assumes
+    no line breaks inside quoted fields, which holds for the FNS and DHS files.
+    Zip archives are one part (None, None).
+    """
+    if path.suffix.lower() == '.zip':
+        return [(None, None)]
+
+    size = path.stat().st_size
+    with open(path, 'rb') as f:
+        if start is None:
+            f.readline()  # header
+            start = f.tell()
+        bounds = [start]
+        while bounds[-1] + part_bytes < size:
+            f.seek(bounds[-1] + part_bytes)
+            f.readline()
+            bounds.append(f.tell())
+    if bounds[-1] < size:
+        bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def read_blocks(path, chunksize=None, part=(None, None), columns=None):
+    """Read a file, or one byte range of it (rows only, named by columns), in chunksize-row blocks."""
+    start, end = part
+    if start is None:
+        with open_csv(path) as f:
+            if chunksize:
+                yield from pd.read_csv(f, chunksize=chunksize)
+            else:
+                yield pd.read_csv(f)
+        return
+
+    with open(path, 'rb') as f:
+        f.seek(start)
+        rows = io.BytesIO(f.read(end - start))
+    if chunksize:
+        yield from pd.read_csv(rows, header=None, names=columns, chunksize=chunksize)
+    else:
+        yield pd.read_csv(rows, header=None, names=columns)
+
+
+def part_digest(path, part):
+    """SHA-256 of one part's bytes (the whole file for (None, None)) and whether it ends at a line end."""
+    start, end = part
+    digest = hashlib.sha256()
+    last = b''
+    with open(path, 'rb') as f:
+        f.seek(start or 0)
+        remaining = None if end is None else end - (start or 0)
+        while remaining is None or remaining > 0:
+            block = f.read(1 << 20 if remaining is None else min(1 << 20, remaining))
+            if not block:
+                break
+            digest.update(block)
+            last = block[-1:]
+            if remaining is not None:
+                remaining -= len(block)
+    return digest.hexdigest(), last == b'\n'
+
+
+def coalesce_parts(path, parts, part_bytes=PART_BYTES):
+    """
+    Join runs of adjacent parts that fit in part_bytes together into one part,
+    merging their stats and hashing the joined range, so the small part each
+    incremental run appends does not grow the cache entry without bound.
+    """
+    runs = []
+    for part in parts:
+        start, end = part['part']
+        if (runs and start is not None and runs[-1][-1]['part'][1] == start
+                and end - runs[-1][0]['part'][0] <= part_bytes):
+            runs[-1].append(part)
+        else:
+            runs.append([part])
+
+    joined = []
+    for run in runs:
+        if len(run) == 1:
+            joined.append(run[0])
+            continue
+        span = (run[0]['part'][0], run[-1]['part'][1])
+        sha256, line_end = part_digest(path, span)
+        stats = None
+        for part in run:
+            stats = merge_stats(stats, part['stats'])
+        joined.append({'part': list(span), 'sha256': sha256, 'lineEnd': line_end, 'stats': stats})
+    return joined
+
+
+def scan_part(path, part, columns, plan, chunksize=None):
+    """Statistics for one part of a file (runs in a worker process with --jobs)."""
+    stats = None
+    for block in read_blocks(path, chunksize, part, columns):
+        stats = merge_stats(stats, scan_block(block, plan))
+    return stats
+
+
+def numeric_block(df, columns):
+    """Columns as one float64 array (NaN for missing; non-numeric text counts as missing)."""
+    block = df[columns]
+    if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in block.dtypes):
+        block = block.apply(pd.to_numeric, errors='coerce')
+    return block.to_numpy(dtype='float64', na_value=np.nan)
+
+
+def scan_block(df, plan):
+    """
+    Compute every statistic a scan plan asks for from one block of rows.
+
+    Numeric columns are scanned together as one 2-D array, so the negative,
+    zero and missing counts and the min/max/sum of every column come out of
+    the same few vectorized reductions. Means are kept as sum and count and
+    dates as counts per distinct value, so the report never needs the rows again.
+    Affected rows are kept as the positions of the first ROW_SAMPLE in the
+    block, and the time spent on each section of the plan in 'seconds'.
+    """
+    stats = {'rows': len(df), 'columns': list(df.columns), 'filled': {}, 'numeric': {},
+             'dates': {}, 'coordinates': {}, 'totals': None, 'values': {}, 'seconds': {}}
+    clock = time.perf_counter()
+
+    def lap(section):
+        nonlocal clock
+        now = time.perf_counter()
+        stats['seconds'][section] = now - clock
+        clock = now
+
+    if plan['filled']:
+        # A column is empty only if every value is missing; the first rows usually settle it
+        stats['filled'] = {col: bool(df[col].iloc[:1024].notna().any() or df[col].notna().any())
+                           for col in df.columns}
+        lap('filled')
+
+    if plan['numeric']:
+        values = numeric_block(df, plan['numeric'])
+        missing = np.isnan(values)
+        counts = len(values) - missing.sum(axis=0)
+        negatives = (values < 0).sum(axis=0)
+        zeros = (values == 0).sum(axis=0)
+        sums = np.where(missing, 0, values).sum(axis=0)
+        mins = np.where(missing, np.inf, values).min(axis=0, initial=np.inf)
+        maxs = np.where(missing, -np.inf, values).max(axis=0, initial=-np.inf)
+        for i, col in enumerate(plan['numeric']):
+            stats['numeric'][col] = {'typed': pd.api.types.is_numeric_dtype(df[col].dtype),
+                                     'count': int(counts[i]), 'negative': int(negatives[i]),
+                                     'zero': int(zeros[i]), 'sum': float(sums[i]),
+                                     'min': float(mins[i]), 'max': float(maxs[i]),
+                                     'negativeRows': sample_rows(values[:, i] < 0) if negatives[i] else [],
+                                     'missingRows': sample_rows(missing[:, i]) if counts[i] < len(values) else []}
+        lap('numeric')
+
+    for col in plan['dates']:
+        parsed = pd.to_datetime(df[col], errors='coerce')
+        invalid = parsed.isna().to_numpy()
+        valid = parsed[~invalid].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        distinct, counts = np.unique(valid, return_counts=True)
+        stats['dates'][col] = {'invalid': len(parsed) - len(valid), 'invalidRows': sample_rows(invalid),
+                               'values': dict(zip(distinct.tolist(), counts.tolist()))}
+        lap(f'dates:{col}')
+
+    for lat_col, lon_col in plan['coordinates']:
+        coords = numeric_block(df, [lat_col, lon_col])
+        lat, lon = coords[:, 0], coords[:, 1]
+        valid = ((lat >= HI_BOUNDS['lat'][0]) & (lat <= HI_BOUNDS['lat'][1]) &
+                 (lon >= HI_BOUNDS['lon'][0]) & (lon <= HI_BOUNDS['lon'][1]))
+        missing = np.isnan(coords).any(axis=1)
+        stats['coordinates'][(lat_col, lon_col)] = {
+            'valid': int(valid.sum()), 'missing': int(missing.sum()),
+            'invalidRows': sample_rows(~valid), 'missingRows': sample_rows(missing)}
+        lap(f'coordinates:{lat_col},{lon_col}')
+
+    if plan['totals']:
+        stated, pa, non_pa = numeric_block(df, list(TOTAL_COLUMNS)).T
+        mismatched = pa + non_pa != stated
+        stats['totals'] = {'mismatches': int(np.count_nonzero(mismatched)), 'mismatchRows': sample_rows(mismatched)}
+        lap('totals')
+
+    for col in plan['values']:
+        stats['values'][col] = df[col].value_counts(sort=False).to_dict()
+        lap(f'values:{col}')
+
+    return stats
+
+
+def sample_rows(mask):
+    """Positions of the first ROW_SAMPLE rows where mask is true."""
+    return np.flatnonzero(mask)[:ROW_SAMPLE].tolist()
+
+
+def shift_rows(rows, more, offset):
+    """Append a later block's sampled positions (shifted past the rows before it), keeping ROW_SAMPLE."""
+    if len(rows) < ROW_SAMPLE:
+        rows.extend(row + offset for row in more[:ROW_SAMPLE - len(rows)])
+
+
+def merge_stats(total, part):
+    """Fold the statistics of one block into the running totals of the blocks before it."""
+    if total is None:
+        return copy.deepcopy(part)
+
+    offset = total['rows']
+    total['rows'] += part['rows']
+    add_counts(total['seconds'], part['seconds'])
+    for col, filled in part['filled'].items():
+        total['filled'][col] = total['filled'].get(col, False) or filled
+
+    for col, column in part['numeric'].items():
+        running = total['numeric'][col]
+        for key in ('count', 'negative', 'zero', 'sum'):
+            running[key] += column[key]
+        running['typed'] = running['typed'] and column['typed']
+        running['min'] = min(running['min'], column['min'])
+        running['max'] = max(running['max'], column['max'])
+        shift_rows(running['negativeRows'], column['negativeRows'], offset)
+        shift_rows(running['missingRows'], column['missingRows'], offset)
+
+    for col, dates in part['dates'].items():
+        running = total['dates'][col]
+        running['invalid'] += dates['invalid']
+        shift_rows(running['invalidRows'], dates['invalidRows'], offset)
+        add_counts(running['values'], dates['values'])
+
+    for key, coordinates in part['coordinates'].items():
+        running = total['coordinates'][key]
+        for field in ('valid', 'missing'):
+            running[field] += coordinates[field]
+        shift_rows(running['invalidRows'], coordinates['invalidRows'], offset)
+        shift_rows(running['missingRows'], coordinates['missingRows'], offset)
+
+    if part['totals'] is not None:
+        total['totals']['mismatches'] += part['totals']['mismatches']
+        shift_rows(total['totals']['mismatchRows'], part['totals']['mismatchRows'], offset)
+
+    for col, counts in part['values'].items():
+        add_counts(total['values'][col], counts)
+
+    return total
+
+
+def add_counts(counts, more):
+    for value, count in more.items():
+        counts[value] = counts.get(value, 0) + count
+
+
+def stats_to_json(stats):
+    """Statistics as JSON-safe data for the validation cache (non-string keys become pairs)."""
+    data = dict(stats)
+    data['dates'] = {col: dict(dates, values=list(dates['values'].items()))
+                     for col, dates in stats['dates'].items()}
+    data['coordinates'] = [[lat, lon, counts] for (lat, lon), counts in stats['coordinates'].items()]
+    data['values'] = {col: list(counts.items()) for col, counts in stats['values'].items()}
+    return data
+
+
+def stats_from_json(data):
+    stats = dict(data)
+    stats['dates'] = {col: dict(dates, values=dict(dates['values']))
+                      for col, dates in data['dates'].items()}
+    stats['coordinates'] = {(lat, lon): counts for lat, lon, counts in data['coordinates']}
+    stats['values'] = {col: dict(counts) for col, counts in data['values'].items()}
+    return stats
+
+
+def stats_shape(stats):
+    """Every key of a stats dict down to the per-column fields (not the counted values)."""
+    shape = set(stats)
+    for section in ('filled', 'seconds', 'values'):
+        shape.update((section, str(key)) for key in stats[section])
+    for section in ('numeric', 'dates', 'coordinates'):
+        for key, fields in stats[section].items():
+            shape.update((section, str(key), field) for field in fields)
+    if stats['totals'] is not None:
+        shape.update(('totals', field) for field in stats['totals'])
+    return shape
+
+
+def cacheable_stats(stats):
+    """stats_to_json(stats), checked to come back from the cache with every key it went in with."""
+    data = stats_to_json(stats)
+    lost = stats_shape(stats) - stats_shape(stats_from_json(json.loads(json.dumps(data, default=str))))
+    if lost:
+        raise ValueError(f"validation cache would drop {sorted(lost)}; update stats_to_json/stats_from_json")
+    return data
+
+
+def load_validation_cache(cache_path=CACHE_FILE):
+    """Load the on-disk validation cache, or an empty one if missing/corrupt"""
+    try:
+        with open(cache_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_validation_cache(cache, cache_path=CACHE_FILE):
+    """Write the validation cache atomically"""
+    cache_path = Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        # Value counts can be keyed by numpy scalars; store them as plain numbers
+        json.dump(cache, f, default=lambda o: o.item() if hasattr(o, 'item') else str(o))
+    os.replace(tmp_path, cache_path)
+
+
+def describe_check(kind, params):
+    """A check's id (kind plus the column it looks at) and the scan_block() sections it reads."""
+    if kind in ('dates', 'currency'):
+        return f"{kind}:{params['date_column']}", [f"dates:{params['date_column']}"]
+    if kind == 'coordinates':
+        key = f"{params['lat_col']},{params['lon_col']}"
+        return f"coordinates:{key}", [f"coordinates:{key}"]
+    if kind in ('value_counts', 'categories'):
+        return f"{kind}:{params['column']}", [f"values:{params['column']}"]
+    sections = {'columns': ['filled'], 'numeric': ['numeric'], 'totals': ['totals']}
+    return kind, sections.get(kind, [])
+
+
+class CheckResult:
+    """
+    Outcome of one check. Each finding has a severity ('error', 'warning',
+    'ok' or 'info'), its report line and, for findings about records, their
+    count and the positions (0-based data rows) of up to ROW_SAMPLE of them.
+    seconds covers the scan sections the check reads plus its report; a
+    section shared by two checks counts for both.
+    """
+
+    def __init__(self, check_id, check):
+        self.id = check_id
+        self.check = check
+        self.findings = []
+        self.seconds = 0.0
+
+    def add(self, severity, message, **details):
+        self.findings.append(dict(severity=severity, message=message, **details))
+
+    @property
+    def severity(self):
+        for severity in ('error', 'warning'):
+            if any(finding['severity'] == severity for finding in self.findings):
+                return severity
+        return 'ok'
+
+    def lines(self, *severities):
+        return [SEVERITY_MARKS[finding['severity']] + finding['message']
+                for finding in self.findings if finding['severity'] in severities]
+
+    def to_dict(self):
+        return {'id': self.id, 'check': self.check, 'severity': self.severity,
+                'seconds': round(self.seconds, 4), 'findings': self.findings}
 
-class DataValidator:
-    """Validates SNAP data quality."""
 
-    def __init__(self, file_path):
+class DataValidator:
+    """
+    Validates SNAP data quality.
+
+    With chunksize the file is never held in memory: load_data() only reads
+    the header and the checks run over chunksize-row blocks whose statistics
+    are merged with merge_stats(), so peak memory depends on the chunk size
+    (and the number of distinct dates and categories), not the file size.
+
+    submit() scans the file part by part instead: it is split with
+    split_csv(), each part is scanned with scan_part() (in a process pool if
+    one is given) and generate_report() merges the parts in file order. Given
+    a validation cache, parts validated by an earlier run whose bytes are
+    unchanged reuse their stats, so only appended or changed rows are read.
+
+    Every check leaves a CheckResult in results; the issues, warnings and info
+    lines and generate_report() are rendered from them, and to_dict() gives
+    the same results as data.
+    """
+
+    def __init__(self, file_path, chunksize=None):
         self.file_path = Path(file_path)
+        self.chunksize = chunksize
         self.df = None
-        self.issues = []
-        self.warnings = []
-        self.info = []
-
-    def load_data(self):
-        """Load CSV data."""
+        self.header = None
+        self.results = []
+        self.rows = None
+        self.seconds = 0.0
+        self.checks = []
+        self.pending = None
+        self.cache_entry = None
+        self.reused_rows = None
+
+    @property
+    def issues(self):
+        return [line for result in self.results for line in result.lines('error')]
+
+    @property
+    def warnings(self):
+        return [line for result in self.results for line in result.lines('warning')]
+
+    @property
+    def info(self):
+        return [line for result in self.results for line in result.lines('ok', 'info')]
+
+    def result(self, check_id, check):
+        """Start the result of a check (or of loading the file)."""
+        result = CheckResult(check_id, check)
+        self.results.append(result)
+        return result
+
+    def load_data(self, header_only=False):
+        """Load CSV data (only its header when streaming or scanning in a pool)."""
+        start = time.perf_counter()
         try:
-            self.df = pd.read_csv(self.file_path)
-            self.info.append(f"✓ Loaded {len(self.df):,} records from {self.file_path.name}")
+            with open_csv(self.file_path) as f:
+                if self.chunksize or header_only:
+                    self.header = pd.read_csv(f, nrows=0)
+                else:
+                    self.df = pd.read_csv(f)
+                    self.header = self.df.iloc[:0]
+            self.checks.append(('loaded', {}))
             return True
         except Exception as e:
-            self.issues.append(f"✗ Failed to load file: {e}")
+            self.result('load', 'load').add('error', f"Failed to load file: {e}")
             return False
+        finally:
+            self.seconds += time.perf_counter() - start
 
-    def validate_columns(self, expected_columns=None):
-        """Validate expected columns exist."""
-        if expected_columns:
-            missing = set(expected_columns) - set(self.df.columns)
-            if missing:
-                self.issues.append(f"✗ Missing columns: {missing}")
+    def blocks(self):
+        """The loaded frame, or the file's chunks when streaming."""
+        if self.df is not None:
+            yield self.df
+            return
+        yield from read_blocks(self.file_path, self.chunksize or None)
+
+    def submit(self, executor=None, part_bytes=PART_BYTES, cache=None):
+        """
+        Start scanning the file for the registered checks, one task per part,
+        in executor (or right here without one). cache maps file paths to the
+        entries earlier runs left in cache_entry; matching parts are reused.
+        """
+        checks, self.checks = self.checks, []
+        if not checks:
+            return
+        start = time.perf_counter()
+        try:
+            with open_csv(self.file_path) as f:
+                sample = pd.read_csv(f, nrows=SAMPLE_ROWS)
+            plan = self.compile_plan(checks, sample)
+            columns = list(self.header.columns)
+            parts = self.cached_parts(plan, cache) if cache is not None else []
+
+            if parts and parts[-1]['part'] == [None, None]:  # unchanged zip
+                new_parts = []
             else:
-                self.info.append(f"✓ All expected columns present")
+                new_parts = split_csv(self.file_path, part_bytes, parts[-1]['part'][1] if parts else None)
+            for part in new_parts:
+                sha256, line_end = part_digest(self.file_path, part) if cache is not None else (None, None)
+                args = (self.file_path, part, columns, plan, self.chunksize)
+                parts.append({'part': list(part), 'sha256': sha256, 'lineEnd': line_end,
+                              'stats': executor.submit(scan_part, *args) if executor else scan_part(*args)})
+        except Exception as e:
+            self.result('read', 'read').add('error', f"Failed to read file: {e}")
+            return
+        finally:
+            self.seconds += time.perf_counter() - start
+        self.pending = (checks, plan, parts, cache is not None, part_bytes)
+
+    def cache_key(self, plan):
+        """Cached stats are only valid for the validator version, scan plan and header that wrote them"""
+        header = b''
+        if self.file_path.suffix.lower() != '.zip':
+            with open(self.file_path, 'rb') as f:
+                header = f.readline()
+        plan_hash = hashlib.sha256(json.dumps(plan).encode() + header).hexdigest()[:16]
+        return f"v{VALIDATOR_VERSION}:{plan_hash}"
+
+    def cached_parts(self, plan, cache):
+        """The leading cached parts of this file whose bytes have not changed (the watermark)."""
+        entry = cache.get(str(self.file_path.resolve()))
+        if entry is None or entry['key'] != self.cache_key(plan):
+            return []
+
+        size = self.file_path.stat().st_size
+        parts = []
+        for cached in entry['parts']:
+            start, end = cached['part']
+            if part_digest(self.file_path, (start, end))[0] != cached['sha256']:
+                break
+            if end is not None and end < size and not cached['lineEnd']:
+                break  # its last row was unterminated and may have been extended
+            parts.append(dict(cached, cached=True))
+        return parts
+
+    # The validate_*/check_* methods only register a check. run() compiles every
+    # registered check into one scan plan, reads each column block once with
+    # scan_block() and then reports the checks in the order they were registered.
 
-        # Check for completely empty columns
-        empty_cols = [col for col in self.df.columns if self.df[col].isna().all()]
-        if empty_cols:
-            self.warnings.append(f"⚠ Empty columns: {empty_cols}")
+    def validate_columns(self, expected_columns=None):
+        """Validate expected columns exist."""
+        self.checks.append(('columns', {'expected_columns': expected_columns}))
 
     def validate_dates(self, date_column='Date'):
         """Validate date column."""
-        if date_column not in self.df.columns:
-            self.issues.append(f"✗ Date column '{date_column}' not found")
-            return
-
-        try:
-            self.df[date_column] = pd.to_datetime(self.df[date_column], errors='coerce')
-            invalid_dates = self.df[date_column].isna().sum()
+        self.checks.append(('dates', {'date_column': date_column}))
 
-            if invalid_dates > 0:
-                self.warnings.append(f"⚠ {invalid_dates} invalid dates")
-            else:
-                self.info.append(f"✓ All dates valid")
-
-            # Date range
-            min_date = self.df[date_column].min()
-            max_date = self.df[date_column].max()
-            self.info.append(f"  Date range: {min_date} to {max_date}")
-
-            # Check for gaps
-            self.df_sorted = self.df.sort_values(date_column)
-            date_diffs = self.df_sorted[date_column].diff()
+    def validate_numeric_columns(self, numeric_columns=None):
+        """Validate numeric data columns."""
+        self.checks.append(('numeric', {'numeric_columns': numeric_columns}))
 
-            # For monthly data, expect ~30 day gaps
-            large_gaps = date_diffs[date_diffs > pd.Timedelta(days=60)]
-            if len(large_gaps) > 0:
-                self.warnings.append(f"⚠ Found {len(large_gaps)} gaps > 60 days")
+    def validate_coordinates(self, lat_col='Latitude', lon_col='Longitude', state='HI'):
+        """Validate geographic coordinates."""
+        self.checks.append(('coordinates', {'lat_col': lat_col, 'lon_col': lon_col, 'state': state}))
 
-            # Check for duplicates
-            dups = self.df[date_column].duplicated().sum()
-            if dups > 0:
-                self.warnings.append(f"⚠ {dups} duplicate dates")
+    def validate_referential_integrity(self):
+        """Validate relationships between columns."""
+        self.checks.append(('totals', {}))
 
+    def check_data_currency(self, date_column='Date'):
+        """Check how current the data is."""
+        self.checks.append(('currency', {'date_column': date_column}))
+
+    def count_values(self, column, label, top=10):
+        """List the most common values of a column."""
+        self.checks.append(('value_counts', {'column': column, 'label': label, 'top': top}))
+
+    def validate_categories(self, column, label, expected=None):
+        """List the distinct values of a column and check how many there are."""
+        self.checks.append(('categories', {'column': column, 'label': label, 'expected': expected}))
+
+    def compile_plan(self, checks, sample):
+        """Collect the column blocks and statistics the registered checks need.
+
+        Auto-detected numeric columns are resolved from sample (the first block)
+        and stored on the check.
+        """
+        columns = list(sample.columns)
+        plan = {'filled': False, 'numeric': [], 'dates': [], 'coordinates': [], 'totals': False, 'values': []}
+
+        def add(key, item):
+            if item not in plan[key]:
+                plan[key].append(item)
+
+        for kind, params in checks:
+            if kind == 'columns':
+                plan['filled'] = True
+            elif kind in ('dates', 'currency'):
+                if params['date_column'] in columns:
+                    add('dates', params['date_column'])
+            elif kind == 'numeric':
+                if params['numeric_columns'] is None:
+                    # Auto-detect numeric columns (date columns are still text here, as before).
+                    # When streaming, a column that turns to text in a later block is dropped
+                    # again in report_numeric(), as reading the whole file would have done.
+                    params['detected'] = True
+                    params['numeric_columns'] = sample.select_dtypes(include=[np.number]).columns.tolist()
+                params['numeric_columns'] = [col for col in params['numeric_columns'] if col in columns]
+                for col in params['numeric_columns']:
+                    add('numeric', col)
+            elif kind == 'coordinates':
+                if params['lat_col'] in columns and params['lon_col'] in columns:
+                    add('coordinates', (params['lat_col'], params['lon_col']))
+            elif kind == 'totals':
+                plan['totals'] = all(col in columns for col in TOTAL_COLUMNS)
+            elif kind in ('value_counts', 'categories'):
+                if params['column'] in columns:
+                    add('values', params['column'])
+        return plan
+
+    def run(self):
+        """Run every registered check in a single pass over the data (or collect the submitted parts)."""
+        start = time.perf_counter()
+        plan, stats = None, None
+        try:
+            if self.pending is not None:
+                (checks, plan, parts, caching, part_bytes), self.pending = self.pending, None
+                reused_rows = 0
+                for part in parts:
+                    if part.get('cached'):
+                        part['stats'] = stats_from_json(part['stats'])
+                        reused_rows += part['stats']['rows']
+                    elif isinstance(part['stats'], Future):
+                        part['stats'] = part['stats'].result()
+                if caching:
+                    self.cache_entry = {'key': self.cache_key(plan), 'parts': [
+                        {'part': part['part'], 'sha256': part['sha256'], 'lineEnd': part['lineEnd'],
+                         'stats': cacheable_stats(part['stats'])}
+                        for part in coalesce_parts(self.file_path, parts, part_bytes)
+                    ]}
+                    self.reused_rows = reused_rows
+                for part in parts:
+                    if part.get('cached'):
+                        part['stats']['seconds'] = {}  # not scanned this run
+                    stats = merge_stats(stats, part['stats'])
+            else:
+                checks, self.checks = self.checks, []
+                if not checks:
+                    return
+                for block in self.blocks():
+                    if plan is None:
+                        plan = self.compile_plan(checks, block)
+                    stats = merge_stats(stats, scan_block(block, plan))
         except Exception as e:
-            self.issues.append(f"✗ Date validation error: {e}")
+            self.result('read', 'read').add('error', f"Failed to read file: {e}")
+            return
+        if stats is None:  # header only
+            plan = self.compile_plan(checks, self.header)
+            stats = scan_block(self.header, plan)
+        self.rows = stats['rows']
+
+        for kind, params in checks:
+            check_id, sections = describe_check(kind, params)
+            result = self.result(check_id, kind)
+            report_start = time.perf_counter()
+            getattr(self, f'report_{kind}')(result, stats, **params)
+            result.seconds = (time.perf_counter() - report_start +
+                              sum(stats['seconds'].get(section, 0.0) for section in sections))
+        self.seconds += time.perf_counter() - start
+
+    def report_loaded(self, result, stats):
+        result.add('ok', f"Loaded {stats['rows']:,} records from {self.file_path.name}", count=stats['rows'])
+        if self.reused_rows:
+            result.add('info', f"  Incremental: {stats['rows'] - self.reused_rows:,} new or changed records validated, "
+                               f"{self.reused_rows:,} unchanged records from the validation cache",
+                       count=stats['rows'] - self.reused_rows, cached=self.reused_rows)
+
+    def report_columns(self, result, stats, expected_columns=None):
+        if expected_columns:
+            missing = set(expected_columns) - set(stats['columns'])
+            if missing:
+                result.add('error', f"Missing columns: {missing}", columns=sorted(missing))
+            else:
+                result.add('ok', f"All expected columns present")
 
-    def validate_numeric_columns(self, numeric_columns=None):
-        """Validate numeric data columns."""
-        if numeric_columns is None:
-            # Auto-detect numeric columns
-            numeric_columns = self.df.select_dtypes(include=[np.number]).columns.tolist()
+        # Check for completely empty columns
+        empty_cols = [col for col in stats['columns'] if not stats['filled'][col]]
+        if empty_cols:
+            result.add('warning', f"Empty columns: {empty_cols}", columns=empty_cols)
 
+    def report_dates(self, result, stats, date_column='Date'):
+        if date_column not in stats['columns']:
+            result.add('error', f"Date column '{date_column}' not found", column=date_column)
+            return
+
+        dates = stats['dates'][date_column]
+        if dates['invalid'] > 0:
+            result.add('warning', f"{dates['invalid']} invalid dates", count=dates['invalid'], rows=dates['invalidRows'])
+        else:
+            result.add('ok', f"All dates valid")
+
+        # Date range
+        values = sorted(dates['values'])
+        min_date = pd.Timestamp(values[0]) if values else pd.NaT
+        max_date = pd.Timestamp(values[-1]) if values else pd.NaT
+        result.add('info', f"  Date range: {min_date} to {max_date}",
+                   min=None if pd.isna(min_date) else min_date.isoformat(),
+                   max=None if pd.isna(max_date) else max_date.isoformat())
+
+        # For monthly data, expect ~30 day gaps
+        large_gaps = np.count_nonzero(np.diff(np.array(values, dtype=np.int64)) > GAP_NS)
+        if large_gaps > 0:
+            result.add('warning', f"Found {large_gaps} gaps > 60 days", count=int(large_gaps))
+
+        # Check for duplicates (repeated invalid dates count too)
+        dups = stats['rows'] - len(values) - (dates['invalid'] > 0)
+        if dups > 0:
+            result.add('warning', f"{dups} duplicate dates", count=int(dups))
+
+    def report_numeric(self, result, stats, numeric_columns=None, detected=False):
+        rows = stats['rows']
         for col in numeric_columns:
-            if col not in self.df.columns:
+            column = stats['numeric'][col]
+            if detected and not column['typed']:
                 continue
 
             # Check for negative values (generally invalid for counts/amounts)
-            negatives = (self.df[col] < 0).sum()
-            if negatives > 0:
-                self.warnings.append(f"⚠ {col}: {negatives} negative values")
+            if column['negative'] > 0:
+                result.add('warning', f"{col}: {column['negative']} negative values",
+                           column=col, count=column['negative'], rows=column['negativeRows'])
 
             # Check for zeros (might be valid or might indicate missing data)
-            zeros = (self.df[col] == 0).sum()
-            if zeros > len(self.df) * 0.1:  # More than 10% zeros
-                self.warnings.append(f"⚠ {col}: {zeros} zero values ({zeros/len(self.df)*100:.1f}%)")
+            zeros = column['zero']
+            if zeros > rows * 0.1:  # More than 10% zeros
+                result.add('warning', f"{col}: {zeros} zero values ({zeros/rows*100:.1f}%)", column=col, count=zeros)
 
             # Check for NaN
-            nans = self.df[col].isna().sum()
+            nans = rows - column['count']
             if nans > 0:
-                self.warnings.append(f"⚠ {col}: {nans} missing values ({nans/len(self.df)*100:.1f}%)")
+                result.add('warning', f"{col}: {nans} missing values ({nans/rows*100:.1f}%)",
+                           column=col, count=nans, rows=column['missingRows'])
 
             # Basic statistics
-            if not self.df[col].isna().all():
-                self.info.append(f"  {col}: min={self.df[col].min():,.0f}, max={self.df[col].max():,.0f}, mean={self.df[col].mean():,.0f}")
-
-    def validate_coordinates(self, lat_col='Latitude', lon_col='Longitude', state='HI'):
-        """Validate geographic coordinates."""
-        if lat_col not in self.df.columns or lon_col not in self.df.columns:
+            if column['count'] > 0:
+                mean = column['sum'] / column['count']
+                result.add('info', f"  {col}: min={column['min']:,.0f}, max={column['max']:,.0f}, mean={mean:,.0f}",
+                           column=col, min=column['min'], max=column['max'], mean=mean)
+
+    def report_coordinates(self, result, stats, lat_col='Latitude', lon_col='Longitude', state='HI'):
+        coordinates = stats['coordinates'].get((lat_col, lon_col))
+        if coordinates is None or state != 'HI':
             return
 
-        # Hawaii coordinate bounds: 18°-23°N, 154°-161°W
-        if state == 'HI':
-            valid_lat = (self.df[lat_col] >= 18) & (self.df[lat_col] <= 23)
-            valid_lon = (self.df[lon_col] >= -161) & (self.df[lon_col] <= -154)
-            valid_coords = valid_lat & valid_lon
+        rows = stats['rows']
+        valid_count = coordinates['valid']
+        invalid_count = rows - valid_count
+        missing_count = coordinates['missing']
 
-            invalid_count = (~valid_coords).sum()
-            missing_count = (self.df[lat_col].isna() | self.df[lon_col].isna()).sum()
+        if invalid_count > 0:
+            result.add('warning', f"{invalid_count} records with invalid Hawaii coordinates ({invalid_count/rows*100:.1f}%)",
+                       count=invalid_count, rows=coordinates['invalidRows'])
 
-            if invalid_count > 0:
-                self.warnings.append(f"⚠ {invalid_count} records with invalid Hawaii coordinates ({invalid_count/len(self.df)*100:.1f}%)")
+        if missing_count > 0:
+            result.add('warning', f"{missing_count} records with missing coordinates ({missing_count/rows*100:.1f}%)",
+                       count=missing_count, rows=coordinates['missingRows'])
 
-            if missing_count > 0:
-                self.warnings.append(f"⚠ {missing_count} records with missing coordinates ({missing_count/len(self.df)*100:.1f}%)")
+        result.add('info', f"  Valid coordinates: {valid_count} ({valid_count/rows*100:.1f}%)", count=valid_count)
 
-            valid_count = valid_coords.sum()
-            self.info.append(f"  Valid coordinates: {valid_count} ({valid_count/len(self.df)*100:.1f}%)")
-
-    def validate_referential_integrity(self):
-        """Validate relationships between columns."""
+    def report_totals(self, result, stats):
         # Check if calculated fields match (if they exist)
         # Example: Total = PA + Non-PA
+        if stats['totals'] is None:
+            return
 
-        if 'Calc: SNAP Total PA and Non-PA People' in self.df.columns:
-            if 'SNAP All Persons Public Assistance Participation' in self.df.columns and \
-               'SNAP All Persons Non-Public Assistance Participation' in self.df.columns:
+        mismatches = stats['totals']['mismatches']
+        if mismatches > 0:
+            result.add('warning', f"{mismatches} records where calculated total != stated total",
+                       count=mismatches, rows=stats['totals']['mismatchRows'])
+        else:
+            result.add('ok', f"Calculated totals match stated totals")
 
-                calculated = (self.df['SNAP All Persons Public Assistance Participation'] +
-                            self.df['SNAP All Persons Non-Public Assistance Participation'])
-                stated = self.df['Calc: SNAP Total PA and Non-PA People']
+    def report_currency(self, result, stats, date_column='Date'):
+        if date_column not in stats['columns']:
+            return
 
-                mismatches = (calculated != stated).sum()
-                if mismatches > 0:
-                    self.warnings.append(f"⚠ {mismatches} records where calculated total != stated total")
-                else:
-                    self.info.append(f"✓ Calculated totals match stated totals")
+        values = stats['dates'][date_column]['values']
+        if not values:
+            result.add('warning', f"Could not check data currency: no valid dates in '{date_column}'")
+            return
 
-    def check_data_currency(self, date_column='Date'):
-        """Check how current the data is."""
-        if date_column not in self.df.columns:
+        latest_date = pd.Timestamp(max(values))
+        days_old = (datetime.now() - latest_date).days
+        latest = {'latest': latest_date.date().isoformat(), 'daysOld': days_old}
+
+        if days_old > 365:
+            years_old = days_old / 365
+            result.add('warning', f"Data is {years_old:.1f} years out of date (latest: {latest_date.date()})", **latest)
+        elif days_old > 90:
+            result.add('warning', f"Data is {days_old} days out of date (latest: {latest_date.date()})", **latest)
+        else:
+            result.add('ok', f"Data is current (latest: {latest_date.date()})", **latest)
+
+    def report_value_counts(self, result, stats, column, label, top=10):
+        if column not in stats['values']:
             return
 
-        try:
-            latest_date = pd.to_datetime(self.df[date_column]).max()
-            days_old = (datetime.now() - latest_date).days
-
-            if days_old > 365:
-                years_old = days_old / 365
-                self.warnings.append(f"⚠ Data is {years_old:.1f} years out of date (latest: {latest_date.date()})")
-            elif days_old > 90:
-                self.warnings.append(f"⚠ Data is {days_old} days out of date (latest: {latest_date.date()})")
-            else:
-                self.info.append(f"✓ Data is current (latest: {latest_date.date()})")
+        counts = sorted(stats['values'][column].items(), key=lambda item: -item[1])
+        result.add('info', f"\n  {label}:", column=column)
+        for value, count in counts[:top]:
+            result.add('info', f"    {value}: {count:,}", column=column, value=value, count=count)
 
-        except Exception as e:
-            self.warnings.append(f"⚠ Could not check data currency: {e}")
+    def report_categories(self, result, stats, column, label, expected=None):
+        if column not in stats['values']:
+            return
+
+        values = stats['values'][column]
+        result.add('info', f"\n  {label}: {', '.join(sorted(values))}", column=column, values=sorted(values))
+        if expected is not None and len(values) != expected:
+            result.add('warning', f"Expected {expected} Hawaii {label.lower()}, found {len(values)}",
+                       column=column, count=len(values))
+
+    def quality(self):
+        """Overall rating shown at the top of the report."""
+        if self.issues:
+            return 'ISSUES FOUND'
+        return 'GOOD' if self.warnings else 'EXCELLENT'
+
+    def to_dict(self):
+        """The validation results as data (run the checks first, e.g. with generate_report())."""
+        return {
+            'file': str(self.file_path),
+            'rows': self.rows,
+            'reusedRows': self.reused_rows,
+            'quality': self.quality(),
+            'errors': len(self.issues),
+            'warnings': len(self.warnings),
+            'seconds': round(self.seconds, 4),
+            'checks': [result.to_dict() for result in self.results]
+        }
 
     def generate_report(self):
         """Generate validation report."""
+        self.run()
+
         report = []
         report.append("=" * 70)
         report.append(f"VALIDATION REPORT: {self.file_path.name}")
         report.append("=" * 70)
         report.append("")
 
+        issues, warnings, info = self.issues, self.warnings, self.info
+
         # Summary
-        total_issues = len(self.issues)
-        total_warnings = len(self.warnings)
+        total_issues = len(issues)
+        total_warnings = len(warnings)
 
         if total_issues == 0 and total_warnings == 0:
             report.append("✓ DATA QUALITY: EXCELLENT")
@@ -203,27 +877,27 @@ class DataValidator:
         report.append("")
 
         # Issues (critical)
-        if self.issues:
+        if issues:
             report.append("CRITICAL ISSUES:")
             report.append("-" * 70)
-            for issue in self.issues:
+            for issue in issues:
                 report.append(issue)
             report.append("")
 
         # Warnings
-        if self.warnings:
+        if warnings:
             report.append("WARNINGS:")
             report.append("-" * 70)
-            for warning in self.warnings:
+            for warning in warnings:
                 report.append(warning)
             report.append("")
 
         # Info
-        if self.info:
+        if info:
             report.append("INFORMATION:")
             report.append("-" * 70)
-            for info in self.info:
-                report.append(info)
+            for line in info:
+                report.append(line)
             report.append("")
 
         report.append("=" * 70)
@@ -231,50 +905,27 @@ class DataValidator:
         return "\n".join(report)
 
 
-def validate_monthly_data(file_path):
-    """Validate statewide monthly SNAP data."""
-    validator = DataValidator(file_path)
-
-    if not validator.load_data():
-        return validator.generate_report()
-
+def monthly_checks(validator):
+    """Checks for statewide monthly SNAP data."""
     expected_columns = ['Date', 'Household', 'Persons', 'Per Household', 'Per Person', 'Cost']
     validator.validate_columns(expected_columns)
     validator.validate_dates('Date')
     validator.validate_numeric_columns(['Household', 'Persons', 'Per Household', 'Per Person', 'Cost'])
     validator.check_data_currency('Date')
 
-    return validator.generate_report()
-
-
-def validate_retailer_data(file_path):
-    """Validate SNAP retailer historical data."""
-    validator = DataValidator(file_path)
-
-    if not validator.load_data():
-        return validator.generate_report()
 
+def retailer_checks(validator):
+    """Checks for SNAP retailer historical data."""
     validator.validate_columns()
     validator.validate_coordinates()
     validator.check_data_currency()
 
     # Check for store type distribution
-    if 'Store Type' in validator.df.columns:
-        type_counts = validator.df['Store Type'].value_counts()
-        validator.info.append("\n  Store types:")
-        for store_type, count in type_counts.head(10).items():
-            validator.info.append(f"    {store_type}: {count:,}")
-
-    return validator.generate_report()
-
-
-def validate_county_data(file_path):
-    """Validate county bi-annual SNAP data."""
-    validator = DataValidator(file_path)
+    validator.count_values('Store Type', 'Store types', top=10)
 
-    if not validator.load_data():
-        return validator.generate_report()
 
+def county_checks(validator):
+    """Checks for county bi-annual SNAP data."""
     validator.validate_columns()
     validator.validate_dates('Date')
     validator.validate_numeric_columns()
@@ -282,13 +933,116 @@ def validate_county_data(file_path):
     validator.check_data_currency('Date')
 
     # Check county coverage
-    if 'County' in validator.df.columns:
-        counties = validator.df['County'].unique()
-        validator.info.append(f"\n  Counties: {', '.join(sorted(counties))}")
-        if len(counties) != 4:
-            validator.warnings.append(f"⚠ Expected 4 Hawaii counties, found {len(counties)}")
+    validator.validate_categories('County', 'Counties', expected=4)
+
+
+def generic_checks(validator):
+    """Checks for any other CSV: columns, a 'Date' column and every numeric column."""
+    validator.validate_columns()
+    validator.validate_dates()
+    validator.validate_numeric_columns()
+
+
+def checks_for(file_path):
+    """Determine validation type based on filename."""
+    if 'Monthly' in file_path.name:
+        return monthly_checks
+    if 'Retailer' in file_path.name:
+        return retailer_checks
+    if 'County' in file_path.name:
+        return county_checks
+    return generic_checks
+
+
+def prepare_validator(file_path, checks, chunksize=None, executor=None, cache=None):
+    """
+    Load a file and register its checks. With an executor the scan starts in
+    the pool right away; with a cache it starts here, reusing unchanged parts.
+    """
+    validator = DataValidator(file_path, chunksize)
+    parts = executor is not None or cache is not None
+    if validator.load_data(header_only=parts):
+        checks(validator)
+        if parts:
+            validator.submit(executor, cache=cache)
+    return validator
+
+
+def validate_monthly_data(file_path, chunksize=None):
+    """Validate statewide monthly SNAP data."""
+    return prepare_validator(file_path, monthly_checks, chunksize).generate_report()
+
+
+def validate_retailer_data(file_path, chunksize=None):
+    """Validate SNAP retailer historical data."""
+    return prepare_validator(file_path, retailer_checks, chunksize).generate_report()
+
+
+def validate_county_data(file_path, chunksize=None):
+    """Validate county bi-annual SNAP data."""
+    return prepare_validator(file_path, county_checks, chunksize).generate_report()
 
-    return validator.generate_report()
+
+def validate_generic_data(file_path, chunksize=None):
+    """Validate any other CSV."""
+    return prepare_validator(file_path, generic_checks, chunksize).generate_report()
+
+
+def validate_files(targets, chunksize=None, jobs=1, cache_path=None, full=False):
+    """
+    Validate (file_path, checks) pairs and return their validators, in order,
+    with the checks run (generate_report() / to_dict() for the results). With
+    jobs > 1 every dataset is submitted to one process pool (large files as
+    several parts) before the first is merged, so datasets validate concurrently.
+
+    With cache_path, only rows appended or changed since the cached watermark
+    are validated (every row with full) and the cache is updated afterwards.
+    """
+    old_cache = load_validation_cache(cache_path) if cache_path else None
+    reusable = {} if full and old_cache is not None else old_cache
+
+    if jobs <= 1:
+        validators = [prepare_validator(path, checks, chunksize, cache=reusable) for path, checks in targets]
+        for validator in validators:
+            validator.run()
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            validators = [prepare_validator(path, checks, chunksize, executor, reusable) for path, checks in targets]
+            for validator in validators:
+                validator.run()
+
+    if cache_path:
+        new_cache = dict(old_cache)
+        for validator in validators:
+            if validator.cache_entry is not None:
+                new_cache[str(validator.file_path.resolve())] = validator.cache_entry
+        save_validation_cache(new_cache, cache_path)
+    return validators
+
+
+def write_results(validators, path):
+    """
+    Save the structured results: a .jsonl path gets one line per check appended
+    (for tracking checks across releases), any other path one JSON document.
+    """
+    path = Path(path)
+    run = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    default = lambda o: o.item() if hasattr(o, 'item') else str(o)
+
+    if path.suffix == '.jsonl':
+        with open(path, 'a') as f:
+            for validator in validators:
+                record = validator.to_dict()
+                for check in record.pop('checks'):
+                    line = {'run': run, 'validatorVersion': VALIDATOR_VERSION, 'file': record['file'],
+                            'rows': record['rows'], **check}
+                    f.write(json.dumps(line, default=default) + '\n')
+        return
+
+    with open(path, 'w') as f:
+        json.dump({'run': run, 'validatorVersion': VALIDATOR_VERSION,
+                   'files': [validator.to_dict() for validator in validators]}, f, indent=2, default=default)
+        f.write('\n')
 
 
 def main():
@@ -296,10 +1050,17 @@ def main():
     parser.add_argument('--all', action='store_true', help='Validate all datasets')
     parser.add_argument('--file', type=str, help='Validate specific file')
     parser.add_argument('--output', type=str, help='Save report to file')
+    parser.add_argument('--chunksize', type=int, metavar='ROWS',
+                        help='Stream the file in blocks of ROWS rows instead of loading it (bounded memory)')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Validate datasets, and parts of large files, in N worker processes (0 = one per CPU core)')
+    parser.add_argument('--full', action='store_true',
+                        help='Revalidate every row instead of only rows added or changed since the last run')
+    parser.add_argument('--results', type=str, metavar='PATH',
+                        help='Save per-check results as JSON (.jsonl: append one line per check)')
 
     args = parser.parse_args()
-
-    reports = []
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
 
     if args.file:
         file_path = Path(args.file)
@@ -307,41 +1068,22 @@ def main():
             print(f"✗ File not found: {file_path}")
             return
 
-        # Determine validation type based on filename
-        if 'Monthly' in file_path.name:
-            report = validate_monthly_data(file_path)
-        elif 'Retailer' in file_path.name:
-            report = validate_retailer_data(file_path)
-        elif 'County' in file_path.name:
-            report = validate_county_data(file_path)
-        else:
-            # Generic validation
-            validator = DataValidator(file_path)
-            if validator.load_data():
-                validator.validate_columns()
-                validator.validate_dates()
-                validator.validate_numeric_columns()
-                report = validator.generate_report()
-            else:
-                report = validator.generate_report()
-
-        reports.append(report)
+        validators = validate_files([(file_path, checks_for(file_path))], args.chunksize, jobs, CACHE_FILE, args.full)
+        reports = [validator.generate_report() for validator in validators]
 
     elif args.all:
         # Validate all known datasets
         datasets = [
-            ("Statewide Monthly SNAP FY 89-22.csv", validate_monthly_data),
-            ("Statewide SNAP Retailers Historical- FNS.csv", validate_retailer_data),
-            ("County Bi-Annual SNAP 89-21.csv", validate_county_data),
+            ("Statewide Monthly SNAP FY 89-25.csv", monthly_checks),
+            ("hawaii_snap_retailers_2004-2024_all.csv", retailer_checks),
+            ("County Bi-Annual SNAP 89-21.csv", county_checks),
         ]
 
-        for filename, validate_func in datasets:
-            file_path = DATA_DIR / filename
-            if file_path.exists():
-                report = validate_func(file_path)
-                reports.append(report)
-            else:
-                reports.append(f"\n✗ File not found: {filename}\n")
+        found = [(DATA_DIR / filename, checks) for filename, checks in datasets if (DATA_DIR / filename).exists()]
+        validators = validate_files(found, args.chunksize, jobs, CACHE_FILE, args.full)
+        found_reports = iter([validator.generate_report() for validator in validators])
+        reports = [next(found_reports) if (DATA_DIR / filename).exists() else f"\n✗ File not found: {filename}\n"
+                   for filename, _ in datasets]
 
     else:
         parser.print_help()
@@ -357,6 +1099,10 @@ def main():
             f.write(full_report)
         print(f"\n✓ Report saved to: {args.output}")
 
+    if args.results:
+        write_results(validators, args.results)
+        print(f"\n✓ Results saved to: {args.results}")
+
 
 if __name__ == "__main__":
     main()
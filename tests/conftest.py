@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The scripts run as `python scripts/<name>.py`, so tests import them the same way
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
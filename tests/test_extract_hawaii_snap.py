@@ -0,0 +1,51 @@
+from datetime import datetime
+
+import pandas as pd
+
+from extract_hawaii_snap import (LAYOUTS, find_state_blocks, header_fingerprint,
+                                 layout_from_header, parse_state_block)
+
+
+def sheet(*header_rows):
+    """A regional sheet: title, the given header rows, then the first state block."""
+    rows = [('Supplemental Nutrition Assistance Program', None, None, None, None, None),
+            *header_rows,
+            ('Hawaii', None, None, None, None, None),
+            ('Oct 2016', 93015, 176516, 70254961, 755.31, 398.01)]
+    return pd.DataFrame(rows)
+
+
+def test_new_vintage_header():
+    # FY workbooks (.xlsx): Households, Persons, Benefits, then the per-unit averages
+    df = sheet(('State / Month', 'Households', 'Persons', 'Benefits', 'Per Household', 'Per Person'))
+    assert header_fingerprint(df) == ('households', 'persons', 'benefits', 'per household', 'per person')
+    assert layout_from_header(header_fingerprint(df)) == LAYOUTS['new']
+
+
+def test_old_vintage_header():
+    # FY workbooks (.xls): averages span two header rows and Cost comes last
+    df = sheet(('', 'Average Number', 'Average Number', 'Average Benefit', 'Average Benefit', ''),
+               ('State / Month', 'of Households', 'of Persons', 'Per Household', 'Per Person', 'Cost'))
+    assert layout_from_header(header_fingerprint(df)) == LAYOUTS['old']
+
+
+def test_single_row_average_headers():
+    df = sheet(('Month', 'Households', 'Persons', 'Average Benefit Per Household',
+                'Avg. Benefit Per Person', 'Total Benefits'))
+    assert layout_from_header(header_fingerprint(df)) == {
+        'Household': 1, 'Persons': 2, 'Per Household': 3, 'Per Person': 4, 'Cost': 5
+    }
+
+
+def test_unrecognised_header():
+    assert layout_from_header(('households', 'persons', '', '', '')) is None
+
+
+def test_month_rows_stored_as_dates():
+    # .xls date cells reach the parser as datetimes (WorkbookReader.xls_value)
+    df = sheet(('State / Month', 'Households', 'Persons', 'Benefits', 'Per Household', 'Per Person'))
+    df.loc[len(df)] = (datetime(2016, 11, 1), 93100, 176800, 70300000, 755.08, 397.62)
+
+    assert find_state_blocks(df) == [('Hawaii', 2, len(df))]
+    records = parse_state_block(df, 2, 'Hawaii')
+    assert [record['Month'] for record in records] == ['Oct 2016', 'Nov 2016']
@@ -1,21 +1,30 @@
 // Hawaii SNAP Data Visualization App
 
 // Global data storage
-let monthlyData = null;
-let countyData = null;
-let trendsData = null;
-let metadata = null;
+let assetManifest = null;  // data/manifest.json: output name -> content-hashed copy
+let shardIndex = null;  // data/shards/index.json: files each tab renders from
+const shardCache = new Map();  // Shard path -> promise of its decoded payload
+const derivedIndex = new Map();  // 'YYYY-MM-DD' -> {derived, i} for tooltip trend lines
+const renderedTabs = new Set();
+
+// First month plotted by the long-history charts
+const CHART_START = '1999-01-01';
 
 // Chart instances
 const charts = {};
 
-// Initialize app
+// Initialize app: only the active tab's data is fetched before the first chart
 document.addEventListener('DOMContentLoaded', async () => {
     setupTabs();
-    await loadData();
-    hideLoading();
-    initializeCharts();
-    populateStats();
+    try {
+        assetManifest = await loadAssetManifest();
+        shardIndex = await fetchShard('shards/index.json');
+        await renderTab(document.querySelector('.tab-button.active').dataset.tab);
+        hideLoading();
+    } catch (error) {
+        console.error('Error loading data:', error);
+        showError('Failed to load data. Please refresh the page.');
+    }
 });
 
 // Tab navigation
@@ -38,30 +47,260 @@ function setupTabs() {
                     content.classList.add('active');
                 }
             });
+
+            renderTab(tabName).catch(error => {
+                console.error(`Error loading ${tabName} data:`, error);
+            });
         });
     });
 }
 
-// Load data from JSON files
-async function loadData() {
+// Charts and stats for each tab, given the data loadTabData() fetched for it
+const tabRenderers = {
+    overview: data => {
+        populateOverviewStats(data.summary);
+        createOverviewChart(data.lod || data.monthly);
+    },
+    trends: data => {
+        populateTrendStats(data.summary);
+        createHouseholdsChart(data.lod || data.monthly);
+        createPersonsChart(data.lod || data.monthly);
+    },
+    benefits: data => {
+        const monthly = bundleMonthlySeries(data.bundle);
+        createBenefitChart(monthly);
+        createCostChart(monthly);
+    },
+    covid: data => {
+        populateCovidStats(data.trends);
+        createCovidChart(data.trends);
+    },
+    retailers: () => {
+        createFoodHubsChart();
+    },
+    counties: data => {
+        populateCountyDetails(data.counties);
+        createCountyChart(data.counties);
+        createPAChart(data.counties);
+        // The per-county shards are only needed for the history chart, so
+        // they load after the snapshot charts are drawn
+        Promise.all(shardIndex.counties.map(county => loadCountySeries(county.fips)))
+            .then(createCountyTrendChart)
+            .catch(error => console.warn('County time series unavailable:', error));
+    }
+};
+
+// Render a tab the first time it is shown
+async function renderTab(tabName) {
+    if (renderedTabs.has(tabName) || !tabRenderers[tabName]) return;
+    renderedTabs.add(tabName);
     try {
-        const [monthlyRes, countyRes, trendsRes, metadataRes] = await Promise.all([
-            fetch('data/monthly.json'),
-            fetch('data/county.json'),
-            fetch('data/trends.json'),
-            fetch('data/metadata.json')
-        ]);
-
-        monthlyData = await monthlyRes.json();
-        countyData = await countyRes.json();
-        trendsData = await trendsRes.json();
-        metadata = await metadataRes.json();
-
-        console.log('Data loaded successfully');
+        tabRenderers[tabName](await loadTabData(tabName));
     } catch (error) {
-        console.error('Error loading data:', error);
-        showError('Failed to load data. Please refresh the page.');
+        renderedTabs.delete(tabName);
+        throw error;
+    }
+}
+
+// Fetch the shards the index lists for a tab. Charts with a level-of-detail
+// series render from it alone (the decade shards are only a fallback for
+// them); the derived measures load afterwards in the background for tooltip trend lines.
+async function loadTabData(tabName) {
+    const { lod, monthly, derived, bundle, ...files } = shardIndex.tabs[tabName] || {};
+    const data = {};
+
+    const requests = Object.entries(files).map(async ([key, path]) => {
+        data[key] = await fetchShard(path);
+    });
+    if (bundle) {
+        requests.push(loadSeriesBundle(bundle).then(series => { data.bundle = series; }));
+    }
+    if (lod) {
+        requests.push(loadLevelOfDetail(lod).then(level => { data.lod = level; }));
+    }
+    await Promise.all(requests);
+
+    if (monthly && !data.lod) {
+        data.monthly = await loadMonthlyShards(monthly);
+    }
+
+    // Started once the chart data is in, so they do not compete with it
+    if (derived) {
+        loadDerivedShards(derived).catch(error => console.warn('Trend lines unavailable:', error));
+    }
+    return data;
+}
+
+// The manifest is the only data file that is revalidated on every visit; the
+// hashed copies it lists are cached as immutable, and the shard index and
+// lod.json come inline. Without one (e.g. a local build that predates it)
+// files are fetched under their plain names.
+async function loadAssetManifest() {
+    try {
+        const res = await fetch('data/manifest.json', { cache: 'no-cache' });
+        if (!res.ok) throw new Error(`HTTP ${res.status}`);
+        return decodeCompact(await res.json());
+    } catch (error) {
+        console.warn('Asset manifest unavailable, using unhashed data files:', error);
+        return null;
+    }
+}
+
+// URL of a generated data file, e.g. 'shards/summary.json'
+function assetUrl(name) {
+    return (assetManifest && assetManifest.files[name]) || `data/${name}`;
+}
+
+// Fetch a generated data file. A 404 on a hashed copy means a deploy since
+// this page loaded has removed it, so the manifest is reloaded and the
+// file requested once more under its current name.
+async function fetchAsset(name) {
+    let res = await fetch(assetUrl(name));
+    if (isMissing(res) && assetManifest) {
+        assetManifest = (await loadAssetManifest()) || assetManifest;
+        res = await fetch(assetUrl(name));
+    }
+    if (isMissing(res)) throw new Error(`${name}: not found (HTTP ${res.status})`);
+    if (!res.ok) throw new Error(`${name}: HTTP ${res.status}`);
+    return res;
+}
+
+// A 404, or an HTML page served in place of a data file (e.g. a host's
+// catch-all rewrite to index.html answering with status 200)
+function isMissing(res) {
+    return res.status === 404 || (res.headers.get('content-type') || '').startsWith('text/html');
+}
+
+// Fetch and decode a generated data file, once per page load (files inlined
+// in the manifest are not fetched at all)
+function fetchShard(path) {
+    if (assetManifest && assetManifest.inline && assetManifest.inline[path]) {
+        return Promise.resolve(assetManifest.inline[path]);
+    }
+    if (!shardCache.has(path)) {
+        const request = fetchAsset(path).then(res => res.json()).then(decodeCompact);
+        request.catch(() => shardCache.delete(path));
+        shardCache.set(path, request);
+    }
+    return shardCache.get(path);
+}
+
+// Join decade shards into one {labels, datasets} series
+async function loadMonthlyShards(paths) {
+    const shards = await Promise.all(paths.map(fetchShard));
+    const series = { labels: [], datasets: {} };
+
+    for (const shard of shards) {
+        series.labels.push(...shard.labels);
+        for (const [key, values] of Object.entries(shard.datasets)) {
+            (series.datasets[key] = series.datasets[key] || []).push(...values);
+        }
+    }
+    return series;
+}
+
+// Register the derived measures of decade shards for trendLines()
+async function loadDerivedShards(paths) {
+    const shards = await Promise.all(paths.map(fetchShard));
+    for (const shard of shards) {
+        shard.labels.forEach((label, i) => derivedIndex.set(label, { derived: shard.derived, i }));
+    }
+}
+
+// Time series of one county from its shard (see shardIndex.counties)
+function loadCountySeries(fips) {
+    const county = shardIndex.counties.find(c => c.fips === fips);
+    return county ? fetchShard(county.file) : Promise.reject(new Error(`No shard for county ${fips}`));
+}
+
+// Expand payloads written by prepare_web_data.py --compact (plain JSON passes through unchanged)
+function decodeCompact(value) {
+    if (Array.isArray(value)) {
+        return value.map(decodeCompact);
+    }
+    if (value === null || typeof value !== 'object') {
+        return value;
+    }
+    if (value.$months) {
+        return expandMonths(value.$months);
+    }
+    if (value.$table) {
+        // Columns back to an array of row objects
+        const columns = Object.entries(value.$table).map(([key, column]) => [key, decodeCompact(column)]);
+        const length = columns.length ? columns[0][1].length : 0;
+        return Array.from({ length }, (_, i) =>
+            Object.fromEntries(columns.map(([key, column]) => [key, column[i]]))
+        );
+    }
+    return Object.fromEntries(Object.entries(value).map(([key, item]) => [key, decodeCompact(item)]));
+}
+
+// {start: 'YYYY-MM', offsets | count} -> ['YYYY-MM-01', ...]
+function expandMonths({ start, offsets, count }) {
+    const [year, month] = start.split('-').map(Number);
+    const base = year * 12 + month - 1;
+    const steps = offsets || Array.from({ length: count }, (_, i) => i);
+    return steps.map(offset => {
+        const index = base + offset;
+        const m = String(index % 12 + 1).padStart(2, '0');
+        return `${Math.floor(index / 12)}-${m}-01`;
+    });
+}
+
+// Pick the smallest level from lod.json that gives at least one point per
+// manifest.pixelsPerPoint CSS pixels of chart width (the last level is full
+// resolution). Returns null (use the decade shards) when lod.json is missing.
+async function loadLevelOfDetail(name = 'lod.json', width = chartWidth()) {
+    try {
+        const manifest = await fetchShard(name);
+        const target = width / manifest.pixelsPerPoint;
+        const level = manifest.levels.find(l => l.points >= target) || manifest.levels[manifest.levels.length - 1];
+        return await fetchShard(level.file);
+    } catch (error) {
+        console.warn('Level-of-detail series unavailable, using full resolution:', error);
+        return null;
+    }
+}
+
+function chartWidth() {
+    const container = document.querySelector('.chart-container');
+    return (container && container.clientWidth) || window.innerWidth;
+}
+
+// Map series.bin into typed arrays using its series.json header.
+// Blocks are little-endian and 4-byte aligned, so each view is zero-copy
+// (every browser we target runs on a little-endian CPU).
+async function loadSeriesBundle(base = 'series') {
+    const [header, buffer] = await Promise.all([
+        fetchShard(`${base}.json`),
+        fetchAsset(`${base}.bin`).then(res => res.arrayBuffer())
+    ]);
+    return mapSeriesBundle(header, buffer);
+}
+
+function mapSeriesBundle(header, buffer) {
+    const arrayTypes = { int32: Int32Array, float32: Float32Array };
+    const series = {};
+
+    for (const [name, block] of Object.entries(header.series)) {
+        const view = new arrayTypes[block.type](buffer, block.offset, block.length);
+        series[name] = block.scale === 1 ? view : Float64Array.from(view, value => value / block.scale);
+    }
+
+    return { groups: header.groups, series };
+}
+
+// The bundle's statewide group in monthly.json's {labels, datasets} shape;
+// the datasets stay typed-array views (Chart.js plots them as they are)
+function bundleMonthlySeries({ groups, series }) {
+    const labels = expandMonths({ start: groups.monthly.start, offsets: Array.from(series['monthly/month']) });
+    const datasets = {};
+    for (const [name, values] of Object.entries(series)) {
+        if (name.startsWith('monthly/') && name !== 'monthly/month') {
+            datasets[name.slice('monthly/'.length)] = values;
+        }
     }
+    return { labels, datasets };
 }
 
 function hideLoading() {
@@ -78,9 +317,7 @@ function showError(message) {
 }
 
 // Populate statistics
-function populateStats() {
-    const { metadata: meta, summary, yearOverYear } = monthlyData;
-
+function populateOverviewStats({ metadata: meta, summary }) {
     // Overview stats
     document.getElementById('stat-persons').textContent = formatNumber(meta.latestPersons);
     document.getElementById('stat-persons-date').textContent = `as of ${formatDate(meta.endDate)}`;
@@ -100,24 +337,28 @@ function populateStats() {
     document.getElementById('peak-persons').textContent = formatNumber(summary.peak.persons.value);
     document.getElementById('latest-persons').textContent = formatNumber(meta.latestPersons);
     document.getElementById('latest-households').textContent = formatNumber(meta.latestHouseholds);
+}
 
-    // Year over year
-    const yoyChange = yearOverYear.persons.percentChange;
-    const yoyText = yoyChange >= 0 ? `+${yoyChange}%` : `${yoyChange}%`;
+function populateTrendStats({ yearOverYear }) {
+    // Year over year (null without a month a year before the latest, or when it is zero)
+    const yoyChange = yearOverYear.persons ? yearOverYear.persons.percentChange : null;
+    let yoyText = '--';
+    if (yoyChange !== null && yoyChange !== undefined) {
+        yoyText = yoyChange >= 0 ? `+${yoyChange}%` : `${yoyChange}%`;
+    }
     document.getElementById('yoy-change').textContent = yoyText;
+}
 
+function populateCovidStats(trendsData) {
     // COVID stats
     document.getElementById('pre-covid-households').textContent = formatNumber(trendsData.periods.preCovidAvg.households);
     document.getElementById('peak-covid-households').textContent = formatNumber(trendsData.periods.covidPeak.households);
     document.getElementById('peak-covid-date').textContent = formatDate(trendsData.periods.covidPeak.date);
     document.getElementById('covid-increase').textContent = '+' + formatNumber(trendsData.covidImpact.peakIncrease.households);
     document.getElementById('covid-increase-pct').textContent = trendsData.covidImpact.peakIncrease.householdsPercent;
-
-    // Populate county details
-    populateCountyDetails();
 }
 
-function populateCountyDetails() {
+function populateCountyDetails(countyData) {
     const container = document.getElementById('county-details');
     container.innerHTML = '';
 
@@ -151,19 +392,6 @@ function populateCountyDetails() {
     });
 }
 
-// Initialize all charts
-function initializeCharts() {
-    createOverviewChart();
-    createHouseholdsChart();
-    createPersonsChart();
-    createBenefitChart();
-    createCostChart();
-    createCovidChart();
-    createCountyChart();
-    createPAChart();
-    createFoodHubsChart();
-}
-
 // Chart configurations
 const chartDefaults = {
     responsive: true,
@@ -186,14 +414,14 @@ const chartDefaults = {
     }
 };
 
-function createOverviewChart() {
+function createOverviewChart(series) {
     const ctx = document.getElementById('overviewChart').getContext('2d');
 
     // Filter data to start from 1999
-    const startIndex = monthlyData.labels.findIndex(date => date >= '1999-01-01');
-    const labels = monthlyData.labels.slice(startIndex);
-    const households = monthlyData.datasets.households.slice(startIndex);
-    const persons = monthlyData.datasets.persons.slice(startIndex);
+    const startIndex = series.labels.findIndex(date => date >= CHART_START);
+    const labels = series.labels.slice(startIndex);
+    const households = series.datasets.households.slice(startIndex);
+    const persons = series.datasets.persons.slice(startIndex);
 
     charts.overview = new Chart(ctx, {
         type: 'line',
@@ -202,6 +430,7 @@ function createOverviewChart() {
             datasets: [
                 {
                     label: 'Persons',
+                    metric: 'persons',
                     data: persons,
                     borderColor: '#2563eb',
                     backgroundColor: 'rgba(37, 99, 235, 0.1)',
@@ -211,6 +440,7 @@ function createOverviewChart() {
                 },
                 {
                     label: 'Households',
+                    metric: 'households',
                     data: households,
                     borderColor: '#7c3aed',
                     backgroundColor: 'rgba(124, 58, 237, 0.1)',
@@ -259,6 +489,9 @@ function createOverviewChart() {
                         },
                         label: function(context) {
                             return context.dataset.label + ': ' + formatNumber(context.parsed.y);
+                        },
+                        afterLabel: function(context) {
+                            return trendLines(context.dataset.metric, context.chart.data.labels[context.dataIndex]);
                         }
                     }
                 }
@@ -267,17 +500,17 @@ function createOverviewChart() {
     });
 }
 
-function createHouseholdsChart() {
+function createHouseholdsChart(series) {
     const ctx = document.getElementById('householdsChart').getContext('2d');
-    const startIndex = monthlyData.labels.findIndex(date => date >= '1999-01-01');
+    const startIndex = series.labels.findIndex(date => date >= CHART_START);
 
     charts.households = new Chart(ctx, {
         type: 'line',
         data: {
-            labels: monthlyData.labels.slice(startIndex),
+            labels: series.labels.slice(startIndex),
             datasets: [{
                 label: 'Households Participating',
-                data: monthlyData.datasets.households.slice(startIndex),
+                data: series.datasets.households.slice(startIndex),
                 borderColor: '#7c3aed',
                 backgroundColor: 'rgba(124, 58, 237, 0.1)',
                 borderWidth: 2,
@@ -320,6 +553,9 @@ function createHouseholdsChart() {
                         },
                         label: function(context) {
                             return 'Households: ' + formatNumber(context.parsed.y);
+                        },
+                        afterLabel: function(context) {
+                            return trendLines('households', context.chart.data.labels[context.dataIndex]);
                         }
                     }
                 }
@@ -328,17 +564,17 @@ function createHouseholdsChart() {
     });
 }
 
-function createPersonsChart() {
+function createPersonsChart(series) {
     const ctx = document.getElementById('personsChart').getContext('2d');
-    const startIndex = monthlyData.labels.findIndex(date => date >= '1999-01-01');
+    const startIndex = series.labels.findIndex(date => date >= CHART_START);
 
     charts.persons = new Chart(ctx, {
         type: 'line',
         data: {
-            labels: monthlyData.labels.slice(startIndex),
+            labels: series.labels.slice(startIndex),
             datasets: [{
                 label: 'Persons Participating',
-                data: monthlyData.datasets.persons.slice(startIndex),
+                data: series.datasets.persons.slice(startIndex),
                 borderColor: '#2563eb',
                 backgroundColor: 'rgba(37, 99, 235, 0.1)',
                 borderWidth: 2,
@@ -381,6 +617,9 @@ function createPersonsChart() {
                         },
                         label: function(context) {
                             return 'Persons: ' + formatNumber(context.parsed.y);
+                        },
+                        afterLabel: function(context) {
+                            return trendLines('persons', context.chart.data.labels[context.dataIndex]);
                         }
                     }
                 }
@@ -389,9 +628,9 @@ function createPersonsChart() {
     });
 }
 
-function createBenefitChart() {
+function createBenefitChart(monthlyData) {
     const ctx = document.getElementById('benefitChart').getContext('2d');
-    const startIndex = monthlyData.labels.findIndex(date => date >= '1999-01-01');
+    const startIndex = monthlyData.labels.findIndex(date => date >= CHART_START);
 
     charts.benefit = new Chart(ctx, {
         type: 'line',
@@ -442,6 +681,9 @@ function createBenefitChart() {
                         },
                         label: function(context) {
                             return 'Avg Benefit: $' + formatNumber(context.parsed.y);
+                        },
+                        afterLabel: function(context) {
+                            return trendLines('avgBenefitPerHousehold', context.chart.data.labels[context.dataIndex]);
                         }
                     }
                 }
@@ -450,9 +692,9 @@ function createBenefitChart() {
     });
 }
 
-function createCostChart() {
+function createCostChart(monthlyData) {
     const ctx = document.getElementById('costChart').getContext('2d');
-    const startIndex = monthlyData.labels.findIndex(date => date >= '1999-01-01');
+    const startIndex = monthlyData.labels.findIndex(date => date >= CHART_START);
 
     charts.cost = new Chart(ctx, {
         type: 'line',
@@ -503,6 +745,9 @@ function createCostChart() {
                         },
                         label: function(context) {
                             return 'Total Cost: $' + formatMoney(context.parsed.y);
+                        },
+                        afterLabel: function(context) {
+                            return trendLines('totalCost', context.chart.data.labels[context.dataIndex]);
                         }
                     }
                 }
@@ -511,7 +756,7 @@ function createCostChart() {
     });
 }
 
-function createCovidChart() {
+function createCovidChart(trendsData) {
     const ctx = document.getElementById('covidChart').getContext('2d');
 
     charts.covid = new Chart(ctx, {
@@ -625,7 +870,7 @@ function createCovidChart() {
     });
 }
 
-function createCountyChart() {
+function createCountyChart(countyData) {
     const ctx = document.getElementById('countyChart').getContext('2d');
 
     const countyNames = countyData.counties.map(c => c.name);
@@ -684,7 +929,7 @@ function createCountyChart() {
     });
 }
 
-function createPAChart() {
+function createPAChart(countyData) {
     const ctx = document.getElementById('paChart').getContext('2d');
 
     const countyNames = countyData.counties.map(c => c.name);
@@ -747,6 +992,67 @@ function createPAChart() {
     });
 }
 
+const countyColors = ['#2563eb', '#7c3aed', '#059669', '#d97706'];
+
+function createCountyTrendChart(countySeries) {
+    const ctx = document.getElementById('countyTrendChart').getContext('2d');
+
+    charts.countyTrend = new Chart(ctx, {
+        type: 'line',
+        data: {
+            datasets: countySeries.map((county, i) => ({
+                label: county.name,
+                data: county.dates.map((date, j) => ({ x: date, y: county.persons[j] })),
+                borderColor: countyColors[i % countyColors.length],
+                backgroundColor: 'transparent',
+                borderWidth: 2,
+                fill: false,
+            }))
+        },
+        options: {
+            ...chartDefaults,
+            scales: {
+                x: {
+                    type: 'time',
+                    time: {
+                        unit: 'year'
+                    },
+                    title: {
+                        display: true,
+                        text: 'Year'
+                    }
+                },
+                y: {
+                    beginAtZero: true,
+                    title: {
+                        display: true,
+                        text: 'Persons'
+                    },
+                    ticks: {
+                        callback: function(value) {
+                            return formatNumber(value);
+                        }
+                    }
+                }
+            },
+            plugins: {
+                ...chartDefaults.plugins,
+                tooltip: {
+                    ...chartDefaults.plugins.tooltip,
+                    callbacks: {
+                        title: function(context) {
+                            return formatDate(context[0].parsed.x);
+                        },
+                        label: function(context) {
+                            return context.dataset.label + ': ' + formatNumber(context.parsed.y);
+                        }
+                    }
+                }
+            }
+        }
+    });
+}
+
 // Utility functions
 function formatNumber(num) {
     if (num === null || num === undefined) return '--';
@@ -761,6 +1067,26 @@ function formatMoney(amount) {
     return formatNumber(amount);
 }
 
+function formatPercent(value) {
+    return (value > 0 ? '+' : '') + value.toFixed(1) + '%';
+}
+
+// Extra tooltip lines from the derived decade shards' measures for one metric
+// and 'YYYY-MM-DD' month (none until those shards have loaded)
+function trendLines(metric, date) {
+    const entry = derivedIndex.get(date);
+    if (entry === undefined) return [];
+
+    const index = entry.i;
+    const { yoy, mom, rolling12 } = entry.derived[metric];
+    const format = metric.startsWith('avgBenefit') ? value => '$' + formatNumber(value) : formatNumber;
+    const lines = [];
+    if (yoy[index] !== null) lines.push('Year over year: ' + formatPercent(yoy[index]));
+    if (mom[index] !== null) lines.push('Month over month: ' + formatPercent(mom[index]));
+    if (rolling12[index] !== null) lines.push('12-month average: ' + format(rolling12[index]));
+    return lines;
+}
+
 function formatDate(dateString) {
     if (!dateString) return '--';
     const date = new Date(dateString);